@@ -1147,7 +1147,9 @@ def get_packages_in_graph(args, config, staff, modules):
             raise RiftError(f"Invalid module name {args.module}")
         packages = []
         for pkg in ProjectPackages.list(config, staff, modules, args.packages):
-            pkg.load()
+            # Module is defined in package metadata, there is no need to load
+            # build file.
+            pkg.load_info()
             # Checks package respects module filter and avoid duplicate names
             # that could be caused by packages in multiple formats.
             if pkg.module == args.module and pkg.name not in packages:
@@ -53,6 +53,19 @@ from rift.annex import Annex, is_binary
 from rift.Config import _DEFAULT_VARIANT
 import rift.utils
 
+# Variable definition in spec file
+_VARIABLE_DEF_RE = re.compile(
+    r"%(?P<keyword>(global|define))\s+(?P<name>.*?)\s+(?P<value>.*)"
+)
+# Last variable reference in expression
+_VARIABLE_REF_RE = re.compile(r'(?P<leftbehind>.*)%{?\??(?P<varname>[^}]*)}?')
+# Dist macro in release
+_DIST_RE = re.compile(r".*(?P<dist>%{\??dist}(\s+|$))")
+# Release field in spec file
+_RELEASE_RE = re.compile(r'^[Rr]elease:(?P<spaces>\s+)(?P<release>.*$)')
+# Changelog section in spec file
+_CHANGELOG_RE = re.compile(r'^%changelog(\s|$)')
+
 
 def _header_values(values):
     """ Convert values from header specfile to strings """
@@ -235,9 +248,8 @@ class Spec():
 
     def _parse_vars(self):
         self.variables = {}
-        pattern = r"%(?P<keyword>(global|define))\s+(?P<name>.*?)\s+(?P<value>.*)"
         for index, line in enumerate(self.lines):
-            match = re.match(pattern, line)
+            match = _VARIABLE_DEF_RE.match(line)
             if match:
                 name = match.group('name')
                 value = match.group('value')
@@ -324,7 +336,7 @@ class Spec():
     def _inc_release(self, release):
         dist = self.dist
         pattern = r"(?P<baserelease>.*?)?(?P<num>[0-9]+)"
-        dist_match = re.match(r".*(?P<dist>%{\??dist}(\s+|$))", release)
+        dist_match = _DIST_RE.match(release)
 
         if release.endswith(self.dist):
             pattern += f"({dist})"
@@ -346,7 +358,7 @@ class Spec():
 
     def _match_var(self, expression, pattern='.*[0-9]$'):
         """ Get variable with value matching pattern in expression """
-        match = re.match(r'(?P<leftbehind>.*)%{?\??(?P<varname>[^}]*)}?', expression)
+        match = _VARIABLE_REF_RE.match(expression)
         if match:
             name = match.group('varname')
             left = match.group('leftbehind')
@@ -396,8 +408,7 @@ class Spec():
         chlg_match = None
         for i, _ in enumerate(self.lines):
             if bump:
-                release_match = re.match(r'^[Rr]elease:(?P<spaces>\s+)(?P<release>.*$)',
-                                         self.lines[i])
+                release_match = _RELEASE_RE.match(self.lines[i])
                 if release_match:
                     release_str = release_match.group('release')
                     # If Release field contains only variables, we may need to
@@ -415,7 +426,7 @@ class Spec():
                             var.value = self._inc_release(var.value)
                             var.spec_output(self.lines)
 
-            chlg_match = re.match(r'^%changelog(\s|$)', self.lines[i])
+            chlg_match = _CHANGELOG_RE.match(self.lines[i])
             if chlg_match:
                 if len(self.lines) > i + 1 and self.lines[i + 1].strip() != "":
                     newchangelogentry += "\n"
@@ -118,7 +118,6 @@ class PackagesDependencyGraph:
     """Graph of dependencies between packages in Rift project."""
     def __init__(self):
         self.nodes = []
-        self.path = None
         self.represented_nodes = None  # used and initialized in _draw_nodes()
         self.external_deps = None  # initialized in draw()
 
@@ -257,116 +256,99 @@ class PackagesDependencyGraph:
                         )
         print('}')
 
-    def _dep_index(self, new, result):
+    @staticmethod
+    def _components(start):
         """
-        The new and results arguments are list of build requirements. The result
-        contains the current list of build requirements. The first item of the
-        new list is the build requirement to insert in result list followed by
-        all its own build requirements.
-
-        If the first item in new is already present in result, return True and
-        the index of this item in result. Else, it returns False and the first
-        index of its build requirements in result. If none of its build
-        requirements is found in result, return index -1.
+        Return the list of strongly connected components of the subgraph of
+        reverse dependencies reachable from the given start node, computed with
+        Tarjan's algorithm. Components are returned in reverse topological
+        order, ie. after the components of their reverse dependencies. Nodes of
+        every component are sorted in discovery order.
         """
-        # Search first item of new in result. If found, return True and its
-        # index.
-        for index, build_requirement in enumerate(result):
-            if build_requirement.package == new[0].package:
-                return True, index
-
-        # First item not found in result, Return false and the first index of
-        # of its build requirement.
-        for index, build_requirement in enumerate(result):
-            for new_build_requirement in new[1:]:
-                if new_build_requirement.package == build_requirement.package:
-                    return False, index
-
-        # No build requirement found in result, return false and -1.
-        return False, -1
+        index = {start: 0}
+        lowlink = {start: 0}
+        stack = [start]
+        on_stack = {start}
+        components = []
+        # Iterative depth-first search with the iterator over the remaining
+        # reverse dependencies of every node in the current path. Reverse
+        # dependencies are explored backward so that, when components order is
+        # eventually reversed, they appear in the order of rdeps lists.
+        path = [(start, reversed(start.rdeps))]
+        while path:
+            node, rdeps = path[-1]
+            for rdep in rdeps:
+                if rdep not in index:
+                    index[rdep] = lowlink[rdep] = len(index)
+                    stack.append(rdep)
+                    on_stack.add(rdep)
+                    path.append((rdep, reversed(rdep.rdeps)))
+                    break
+                if rdep in on_stack:
+                    lowlink[node] = min(lowlink[node], index[rdep])
+            else:
+                # All reverse dependencies of node have been explored.
+                path.pop()
+                if path:
+                    parent = path[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    # Node is the root of a component, pop its members from
+                    # the stack.
+                    component = []
+                    member = None
+                    while member is not node:
+                        member = stack.pop()
+                        on_stack.remove(member)
+                        component.append(member)
+                    component.reverse()
+                    components.append(component)
+        return components
 
-    def _solve(self, node, reason, depth=0):
+    def _solve(self, start):
         """
         Return list of recursive build requirements for the provided package
-        dependency node. The "reason" argument is a string to textually justify
-        the build requirement of the given node. The depth argument is used to
-        track the depth of recursive path in the dependency graph.
+        dependency node, ordered so that every package comes after the packages
+        it depends on. Packages in a dependency loop are ordered as they are
+        discovered from the start node.
         """
-
-        result = []
-        logging.debug(
-            "%s→ Source package %s:%s must be rebuilt",
-            '  '*depth,
-            node.package.format,
-            node.package.name
-        )
-        result.append(
-            BuildRequirement(node.package, [reason])
-        )
-
-        # Remove the end of the processing path after the current node
-        del self.path[max(0, depth-1):-1]
-        # Add current node to the processing path
-        self.path.append(node)
-
-        for rdep in node.rdeps:
-            reason = node.rdep_reason(rdep)
-            # If reverse dependency has already been processed in the processing
-            # path to the current node, add it to resulting list and stop
-            # processing to avoid endless loop.
-            if rdep in self.path[0:depth]:
+        nodes = []
+        for component in reversed(self._components(start)):
+            if len(component) > 1:
                 logging.debug(
-                    "%s   ⥀ Loop detected on node %s:%s at depth %d: %s",
-                    '  '*depth,
-                    rdep.package.format,
-                    rdep.package.name,
-                    depth,
-                    '→'.join(
+                    "⥀ Dependency loop detected between packages: %s",
+                    ', '.join(
                         f"{node.package.format}:{node.package.name}"
-                        for node in self.path + [rdep]
+                        for node in component
                     ),
                 )
-                result.append(BuildRequirement(rdep.package, [reason]))
-                continue
+            nodes.extend(component)
+
+        # Collect the reasons of every build requirement with the relations
+        # between reachable nodes.
+        reasons = {node: [] for node in nodes}
+        reasons[start].append("User request")
+        for node in nodes:
             logging.debug(
-                "%s  Exploring reverse dependency %s:%s",
-                '  '*depth,
-                rdep.package.format,
-                rdep.package.name
+                "→ Source package %s:%s must be rebuilt",
+                node.package.format,
+                node.package.name
             )
-            # Iterate over all recursively solved build requirements for this
-            # reverse dependency.
-            build_requirements = self._solve(rdep, reason, depth+1)
-            for idx, build_requirement in enumerate(build_requirements):
-                found, position = self._dep_index(build_requirements[idx:], result)
-                if found:
-                    # Build requirement already present in result, just extend
-                    # the build reasons.
-                    result[position].reasons.extend(
-                        build_requirement.reasons
-                    )
-                elif position == -1:
-                    # The recursive build requirements of the new build
-                    # requirement are not present in the list, just append the
-                    # new build requirement in result.
-                    result.append(build_requirement)
-                else:
-                    # Insert the new build requirement before its first
-                    # recursive build requirements in result.
-                    result.insert(position, build_requirement)
-        return result
+            for rdep in node.rdeps:
+                reasons[rdep].append(node.rdep_reason(rdep))
+
+        return [BuildRequirement(node.package, reasons[node]) for node in nodes]
 
     def solve(self, package):
         """
         Return list of recursive build requirements for the provided package.
         """
-        self.path = []  # Start with empty path
         for node in self.nodes:
             if (
                 node.package.name == package.name and
                 node.package.format == package.format
             ):
-                return self._solve(node, "User request")
+                return self._solve(node)
 
         # Package not found in graph, return empty list.
         return []
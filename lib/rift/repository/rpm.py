@@ -40,6 +40,7 @@ import shutil
 import glob
 import threading
 import platform
+from functools import cached_property
 from subprocess import Popen, PIPE, STDOUT, run, CalledProcessError
 
 from rift import RiftError
@@ -310,20 +311,29 @@ class ArchRepositoriesRPM(ArchRepositoriesBase):
                 },
             )
             self.working.create()
-        self.supplementaries = []
-        repos = config.get('repos', arch=arch)
+        self.config = config
+
+    @cached_property
+    def supplementaries(self):
+        """
+        The list of supplementary repositories defined in the project for the
+        architecture, built on first access.
+        """
+        supplementaries = []
+        repos = self.config.get('repos', arch=self.arch)
         if repos:
             for name, data in repos.items():
-                self.supplementaries.append(
+                supplementaries.append(
                     ConsumableRepository(
                         data['url'],
                         name=name,
                         priority=data.get('priority'),
                         options=data,
-                        default_proxy=config.get('proxy'),
+                        default_proxy=self.config.get('proxy'),
                         variants=data.get('variants'),
                     )
                 )
+        return supplementaries
 
     @property
     def all(self):
@@ -3,14 +3,18 @@
 #
 
 import os.path
+import re
 import shutil
-import atexit
-from unittest.mock import patch, Mock, call
+from unittest.mock import patch, Mock, MagicMock, call
 import subprocess
 import textwrap
+import unittest
 from io import StringIO
+from contextlib import redirect_stdout
 
 from .TestUtils import (
+    copy_gpg_keyring,
+    remove_gpg_keyrings,
     make_temp_file,
     make_temp_dir,
     gen_rpm_spec,
@@ -18,7 +22,9 @@ from .TestUtils import (
     host_rpmlint,
     RiftTestCase,
     RiftProjectTestCase,
+    RiftProjectSharedTestCase,
     SubPackage,
+    GPG_KEY,
 )
 
 from .VM import GLOBAL_CACHE, VALID_IMAGE_URL, PROXY
@@ -33,10 +39,41 @@ from rift.Config import _DEFAULT_VARIANT
 from rift.package.rpm import PackageRPM, ActionableArchPackageRPM
 from rift.TestResults import TestResults, TestCase
 from rift.package._virtual import PackageVirtual
-from rift.RPM import RPM, Spec
+from rift.RPM import RPM
 from rift import RiftError, DeclError
 
 
+MATERIALS_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'materials'
+)
+
+# Expected error messages shared by multiple tests
+RE_MISSING_MAINTAINER = re.compile(r"You must specify a maintainer")
+RE_UNKNOWN_MAINTAINER = re.compile(r"Maintainer 'Fail' is not defined")
+RE_NOT_SRC_RPM = re.compile(r".*pkg-1\.0-1\.noarch\.rpm is not a source RPM$")
+RE_FILE_NOT_FOUND = re.compile(r"Could not find '/dev/fail'")
+RE_MISSING_FILE_PATH = re.compile(r"You must specifiy a file path \(-f\)")
+
+# Expected outputs of query action
+EXPECTED_QUERY_DEFAULT = (
+    "NAME MODULE       MAINTAINERS FORMAT VERSION RELEASE MODULEMANAGER"
+    + textwrap.dedent("""
+    ---- ------       ----------- ------ ------- ------- -------------
+    pkg1 Great module Myself      rpm    1.0     1       buddy@somewhere.org
+    pkg2 Great module Myself      rpm    2.1     3       buddy@somewhere.org
+    """)
+)
+EXPECTED_QUERY_FORMAT = (
+    "NAME MODULE       ORIGIN REASON          FORMAT TESTS VERSION "
+    "ARCH   RELEASE CHANGELOGNAME                      CHANGELOGTIME "
+    "MAINTAINERS MODULEMANAGER       BUILDREQUIRES"
+    + textwrap.dedent("""
+    ---- ------       ------ ------          ------ ----- ------- ----   ------- -------------                      ------------- ----------- -------------       -------------
+    pkg1 Great module Vendor Missing feature rpm    1     1.0     noarch 1       Myself <buddy@somewhere.org> 1.0-1 2019-02-26    Myself      buddy@somewhere.org br-package
+    pkg2 Great module Vendor Missing feature rpm    1     2.1     noarch 3       Myself <buddy@somewhere.org> 2.1-3 2019-02-26    Myself      buddy@somewhere.org br-package
+    """)
+)
+
 VALID_REPOS = {
     'os': {
         'url': 'https://repo.almalinux.org/almalinux/8/BaseOS/$arch/os/',
@@ -49,12 +86,87 @@ VALID_REPOS = {
     },
 }
 
+# Patch of pkg spec file release used by gitlab and gerrit tests
+PKG_SPEC_PATCH = textwrap.dedent("""
+    diff --git a/packages/pkg/pkg.spec b/packages/pkg/pkg.spec
+    index d1a0d0e7..b3e36379 100644
+    --- a/packages/pkg/pkg.spec
+    +++ b/packages/pkg/pkg.spec
+    @@ -1,6 +1,6 @@
+     Name:    pkg
+     Version:        1.0
+    -Release:        1
+    +Release:        2
+     Summary:        A package
+     Group:          System Environment/Base
+     License:        GPL
+    """)
+
+# Architectures of functional build tests
+FUNCTIONAL_ARCHS = ['x86_64', 'aarch64']
+
+
+def skip_unless_functional(func):
+    """
+    Skip functional test unless RIFT_FUNCTIONAL_TESTS environment variable is
+    set.
+    """
+    return unittest.skipUnless(
+        os.environ.get('RIFT_FUNCTIONAL_TESTS'),
+        "functional tests are disabled, set RIFT_FUNCTIONAL_TESTS to enable"
+    )(func)
+
+
+def skip_unless_functional_build(func):
+    """
+    Skip functional build test unless RIFT_FUNCTIONAL_TESTS environment
+    variable is set and qemu-$arch-static executable is found for at least one
+    of the architectures of functional tests.
+    """
+    if not os.environ.get('RIFT_FUNCTIONAL_TESTS'):
+        return skip_unless_functional(func)
+    if not any(
+        os.path.exists(f"/usr/bin/qemu-{arch}-static")
+        for arch in FUNCTIONAL_ARCHS
+    ):
+        return unittest.skip("qemu-user-static is not available")(func)
+    return func
+
+
+def tearDownModule():
+    # Remove GPG keyrings generated for signature tests
+    remove_gpg_keyrings()
+
+
+def setup_mock_pkg_rpm(test, mock_pkg_rpm, name='pkg'):
+    """
+    Create fake package without build requirement in test case project and
+    initialize mocked PackageRPM instances of this package, which support all
+    archs. Return tuple of PackageRPM and ActionableArchPackageRPM mock objects.
+    """
+    test.make_pkg(name=name, build_requires=[])
+    # PackageRPM instances mock is specced on PackageRPM class to satisfy
+    # zero-argument super() in PackageRPM.__init__().
+    mock_pkg_rpm.return_value = MagicMock(spec=PackageRPM)
+    mock_pkg_rpm_objs = mock_pkg_rpm.return_value
+    # Initialize PackageRPM object attributes
+    PackageRPM.__init__(
+        mock_pkg_rpm_objs, name, test.config, test.staff, test.modules)
+    # Make PackageRPM.supports_arch() return True for all archs
+    mock_pkg_rpm_objs.supports_arch.return_value = True
+    # Mock ActionableArchPackageRPM objects
+    mock_act_arch_pkg_rpm = Mock(spec=ActionableArchPackageRPM)
+    mock_pkg_rpm_objs.for_arch.return_value = mock_act_arch_pkg_rpm
+    return mock_pkg_rpm_objs, mock_act_arch_pkg_rpm
+
 
 class ControllerTest(RiftTestCase):
 
     def test_main_version(self):
         """simple 'rift --version'"""
-        self.assert_except(SystemExit, "0", main, ['--version'])
+        with self.assertRaises(SystemExit) as cm:
+            main(['--version'])
+        self.assertEqual(cm.exception.code, 0)
 
 
 class ControllerProjectActionCreateTest(RiftProjectTestCase):
@@ -67,12 +179,14 @@ class ControllerProjectActionCreateTest(RiftProjectTestCase):
         for cmd in (['create', '-m', 'Great module', '-r', 'Good reason'],
                     ['create', 'pkg', '-r', 'Good reason'],
                     ['create', 'pkg', '-m', 'Great module']):
-            with self.assertRaisesRegex(SystemExit, "2"):
-                main(cmd)
+            with self.subTest(cmd=cmd):
+                with self.assertRaises(SystemExit) as cm:
+                    main(cmd)
+                self.assertEqual(cm.exception.code, 2)
 
     def test_create_missing_maintainer(self):
         """create without maintainer"""
-        with self.assertRaisesRegex(RiftError, "You must specify a maintainer"):
+        with self.assertRaisesRegex(RiftError, RE_MISSING_MAINTAINER):
             main(['create', 'pkg', '-m', 'Great module', '-r', 'Good reason'])
 
     def test_create(self):
@@ -89,46 +203,59 @@ class ControllerProjectActionCreateTest(RiftProjectTestCase):
 
     def test_create_unknown_maintainer(self):
         """create with unknown maintainer fails"""
-        with self.assertRaisesRegex(
-            RiftError, "Maintainer 'Fail' is not defined"):
+        with self.assertRaisesRegex(RiftError, RE_UNKNOWN_MAINTAINER):
             main(['create', 'pkg', '-m', 'Great module', '-r', 'Good reason',
                   '--maintainer', 'Fail'])
 
 
-class ControllerProjectActionImportTest(RiftProjectTestCase):
+class ControllerProjectImportTestCase(RiftProjectTestCase):
     """
-    Tests class for Controller action import
+    Base class for Controller actions import and reimport tests
     """
-    @property
-    def src_rpm(self):
-        return os.path.join(
-            os.path.dirname(os.path.abspath(__file__)), 'materials', 'pkg-1.0-1.src.rpm'
-        )
+    src_rpm = f"{MATERIALS_DIR}/pkg-1.0-1.src.rpm"
+    bin_rpm = f"{MATERIALS_DIR}/pkg-1.0-1.noarch.rpm"
+
+    def _check_imported_pkg(self, mock_mock, module, reason):
+        """
+        Load package imported from src_rpm and check its metadata and spec
+        file. Return the loaded package.
+        """
+        # mock Mock.read_spec to return spec file content directly read on host
+        mock_mock.return_value.read_spec = read_file
+        pkg = PackageRPM('pkg', self.config, self.staff, self.modules)
+        pkg.load()
+        self.assertEqual(pkg.module, module)
+        self.assertEqual(pkg.reason, reason)
+        self.assertCountEqual(pkg.maintainers, ['Myself'])
+        self.assertEqual(pkg.spec.changelog_name, 'Myself <buddy@somewhere.org> - 1.0-1')
+        self.assertEqual(pkg.spec.version, '1.0')
+        self.assertEqual(pkg.spec.release, '1')
+        self.assertTrue(os.path.exists(f"{pkg.buildfile}.orig"))
+        return pkg
 
-    @property
-    def bin_rpm(self):
-        return os.path.join(
-            os.path.dirname(os.path.abspath(__file__)), 'materials', 'pkg-1.0-1.noarch.rpm'
-        )
 
+class ControllerProjectActionImportTest(ControllerProjectImportTestCase):
+    """
+    Tests class for Controller action import
+    """
     def test_import_missing_pkg_module_reason(self):
         """import without package, module or reason fails"""
         for cmd in (['import', '-m', 'Great module', '-r', 'Good reason'],
                     ['import', 'pkg.src.rpm', '-r', 'Good reason'],
                     ['import', 'pkg.src.rpm', '-m', 'Great module']):
-            with self.assertRaisesRegex(SystemExit, "2"):
-                main(cmd)
+            with self.subTest(cmd=cmd):
+                with self.assertRaises(SystemExit) as cm:
+                    main(cmd)
+                self.assertEqual(cm.exception.code, 2)
 
     def test_import_missing_maintainer(self):
         """import without maintainer"""
-        with self.assertRaisesRegex(RiftError, "You must specify a maintainer"):
+        with self.assertRaisesRegex(RiftError, RE_MISSING_MAINTAINER):
             main(['import', self.src_rpm, '-m', 'Great module', '-r', 'Good reason'])
 
     def test_import_bin_rpm(self):
         """import binary rpm"""
-        with self.assertRaisesRegex(
-            RiftError,
-            ".*pkg-1.0-1.noarch.rpm is not a source RPM$"):
+        with self.assertRaisesRegex(RiftError, RE_NOT_SRC_RPM):
             main(['import', self.bin_rpm, '-m', 'Great module',
                   '-r', 'Good reason', '--maintainer', 'Myself'])
 
@@ -137,46 +264,24 @@ class ControllerProjectActionImportTest(RiftProjectTestCase):
         """simple import"""
         main(['import', self.src_rpm, '-m', 'Great module', '-r', 'Good reason',
               '--maintainer', 'Myself'])
-        pkg = PackageRPM('pkg', self.config, self.staff, self.modules)
-        # mock Mock.read_spec to return spec file content directly read on host
-        mock_mock.return_value.read_spec = read_file
-        pkg.load()
-        self.assertEqual(pkg.module, 'Great module')
-        self.assertEqual(pkg.reason, 'Good reason')
-        self.assertCountEqual(pkg.maintainers, ['Myself'])
-        self.assertEqual(pkg.spec.changelog_name, 'Myself <buddy@somewhere.org> - 1.0-1')
-        self.assertEqual(pkg.spec.version, '1.0')
-        self.assertEqual(pkg.spec.release, '1')
-        self.assertTrue(os.path.exists(f"{pkg.buildfile}.orig"))
+        pkg = self._check_imported_pkg(
+            mock_mock, 'Great module', 'Good reason')
         shutil.rmtree(os.path.dirname(pkg.metafile))
 
     def test_import_unknown_maintainer(self):
         """import with unknown maintainer fails"""
-        with self.assertRaisesRegex(
-            RiftError, "Maintainer 'Fail' is not defined"):
+        with self.assertRaisesRegex(RiftError, RE_UNKNOWN_MAINTAINER):
             main(['import', self.src_rpm, '-m', 'Great module',
                     '-r', 'Good reason', '--maintainer', 'Fail'])
 
 
-class ControllerProjectActionReimportTest(RiftProjectTestCase):
+class ControllerProjectActionReimportTest(ControllerProjectImportTestCase):
     """
     Tests class for Controller actionre import
     """
-    @property
-    def src_rpm(self):
-        return os.path.join(
-            os.path.dirname(os.path.abspath(__file__)), 'materials', 'pkg-1.0-1.src.rpm'
-        )
-
-    @property
-    def bin_rpm(self):
-        return os.path.join(
-            os.path.dirname(os.path.abspath(__file__)), 'materials', 'pkg-1.0-1.noarch.rpm'
-        )
-
     def test_reimport_missing_maintainer(self):
         """reimport without maintainer"""
-        with self.assertRaisesRegex(RiftError, "You must specify a maintainer"):
+        with self.assertRaisesRegex(RiftError, RE_MISSING_MAINTAINER):
             main(['reimport', self.src_rpm, '-m', 'Great module', '-r', 'Good reason'])
 
     @patch('rift.package.rpm.Mock')
@@ -186,15 +291,8 @@ class ControllerProjectActionReimportTest(RiftProjectTestCase):
         # mock Mock.read_spec to return spec file content directly read on host
         mock_mock.return_value.read_spec = read_file
         main(['reimport', self.src_rpm, '--maintainer', 'Myself'])
-        pkg = PackageRPM('pkg', self.config, self.staff, self.modules)
-        pkg.load()
-        self.assertEqual(pkg.module, 'Great module')
-        self.assertEqual(pkg.reason, 'Missing feature')
-        self.assertCountEqual(pkg.maintainers, ['Myself'])
-        self.assertEqual(pkg.spec.changelog_name, 'Myself <buddy@somewhere.org> - 1.0-1')
-        self.assertEqual(pkg.spec.version, '1.0')
-        self.assertEqual(pkg.spec.release, '1')
-        self.assertTrue(os.path.exists(f"{pkg.buildfile}.orig"))
+        pkg = self._check_imported_pkg(
+            mock_mock, 'Great module', 'Missing feature')
         os.unlink(f"{pkg.buildfile}.orig")
 
 
@@ -229,58 +327,41 @@ class ControllerProjectActionQueryTest(RiftProjectTestCase):
         self.assertEqual(main(['query']), 0)
 
     @patch('rift.package.rpm.Mock')
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_action_query_output_default(self, mock_stdout, mock_mock):
+    def test_action_query_output_default(self, mock_mock):
         self.make_pkg(name="pkg1")
         self.make_pkg(name="pkg2", version='2.1', release='3')
         # mock Mock.read_spec to return spec file content directly read on host
         mock_mock.return_value.read_spec = read_file
-        self.assertEqual(main(['query']), 0)
-        self.assertIn(
-            "NAME MODULE       MAINTAINERS FORMAT VERSION RELEASE MODULEMANAGER",
-            mock_stdout.getvalue())
-        self.assertIn(textwrap.dedent("""
-            ---- ------       ----------- ------ ------- ------- -------------
-            pkg1 Great module Myself      rpm    1.0     1       buddy@somewhere.org
-            pkg2 Great module Myself      rpm    2.1     3       buddy@somewhere.org
-            """),
-            mock_stdout.getvalue())
+        with redirect_stdout(StringIO()) as output:
+            self.assertEqual(main(['query']), 0)
+        self.assertIn(EXPECTED_QUERY_DEFAULT, output.getvalue())
 
     @patch('rift.package.rpm.Mock')
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_action_query_output_format(self, mock_stdout, mock_mock):
+    def test_action_query_output_format(self, mock_mock):
         self.make_pkg(name="pkg1")
         self.make_pkg(name="pkg2", version='2.1', release='3')
         # mock Mock.read_spec to return spec file content directly read on host
         mock_mock.return_value.read_spec = read_file
-        self.assertEqual(
-            main([
-                'query', '--format',
-                '%name %module %origin %reason %format %tests %version %arch %release '
-                '%changelogname %changelogtime %maintainers %modulemanager '
-                '%buildrequires']), 0)
-        self.assertIn(
-            "NAME MODULE       ORIGIN REASON          FORMAT TESTS VERSION "
-            "ARCH   RELEASE CHANGELOGNAME                      CHANGELOGTIME "
-            "MAINTAINERS MODULEMANAGER       BUILDREQUIRES",
-            mock_stdout.getvalue())
-        self.assertIn(textwrap.dedent("""
-            ---- ------       ------ ------          ------ ----- ------- ----   ------- -------------                      ------------- ----------- -------------       -------------
-            pkg1 Great module Vendor Missing feature rpm    1     1.0     noarch 1       Myself <buddy@somewhere.org> 1.0-1 2019-02-26    Myself      buddy@somewhere.org br-package
-            pkg2 Great module Vendor Missing feature rpm    1     2.1     noarch 3       Myself <buddy@somewhere.org> 2.1-3 2019-02-26    Myself      buddy@somewhere.org br-package
-            """),
-            mock_stdout.getvalue())
+        with redirect_stdout(StringIO()) as output:
+            self.assertEqual(
+                main([
+                    'query', '--format',
+                    '%name %module %origin %reason %format %tests %version %arch %release '
+                    '%changelogname %changelogtime %maintainers %modulemanager '
+                    '%buildrequires']), 0)
+        self.assertIn(EXPECTED_QUERY_FORMAT, output.getvalue())
 
 
-class ControllerProjectActionCheckTest(RiftProjectTestCase):
+class ControllerProjectActionCheckNoPkgTest(RiftProjectSharedTestCase):
     """
-    Tests class for Controller action check
+    Tests class for Controller action check which do not require packages
     """
 
     def test_check_without_type(self):
         """check without type fails"""
-        with self.assertRaisesRegex(SystemExit, "2"):
+        with self.assertRaises(SystemExit) as cm:
             main(['check'])
+        self.assertEqual(cm.exception.code, 2)
 
     def test_check_staff(self):
         """simple check staff"""
@@ -294,7 +375,7 @@ class ControllerProjectActionCheckTest(RiftProjectTestCase):
 
     def test_check_staff_not_found(self):
         """check staff file not found fails"""
-        with self.assertRaisesRegex(DeclError, "Could not find '/dev/fail'"):
+        with self.assertRaisesRegex(DeclError, RE_FILE_NOT_FOUND):
             exit_code = main(['check', 'staff', '-f', '/dev/fail'])
             self.assertEqual(exit_code, 1)
 
@@ -310,25 +391,35 @@ class ControllerProjectActionCheckTest(RiftProjectTestCase):
 
     def test_check_modules_not_found(self):
         """check modules file not found fails"""
-        with self.assertRaisesRegex(DeclError, "Could not find '/dev/fail'"):
+        with self.assertRaisesRegex(DeclError, RE_FILE_NOT_FOUND):
             exit_code = main(['check', 'modules', '-f', '/dev/fail'])
             self.assertEqual(exit_code, 1)
 
     def test_check_info_without_file(self):
         """check info without file fails"""
-        with self.assertRaisesRegex(
-            RiftError, r"You must specifiy a file path \(-f\)"
-        ):
+        with self.assertRaisesRegex(RiftError, RE_MISSING_FILE_PATH):
             exit_code = main(['check', 'info'])
             self.assertEqual(exit_code, 1)
 
+    def test_check_spec_without_file(self):
+        """check spec without file fails"""
+        with self.assertRaisesRegex(RiftError, RE_MISSING_FILE_PATH):
+            exit_code = main(['check', 'spec'])
+            self.assertEqual(exit_code, 1)
+
+
+class ControllerProjectActionCheckTest(RiftProjectTestCase):
+    """
+    Tests class for Controller action check
+    """
+
     def test_check_info(self):
         """simple check info"""
         self.make_pkg()
         with self.assertLogs(level='INFO') as log:
             exit_code = main(
                 ['check', 'info', '-f',
-                 os.path.join(self.pkgdirs['pkg'], 'info.yaml')]
+                 f"{self.pkgdirs['pkg']}/info.yaml"]
             )
         self.assertEqual(exit_code, 0)
         self.assertIn(
@@ -343,14 +434,6 @@ class ControllerProjectActionCheckTest(RiftProjectTestCase):
             exit_code = main(['check', 'info', '-f', '/dev/fail'])
             self.assertEqual(exit_code, 1)
 
-    def test_check_spec_without_file(self):
-        """check spec without file fails"""
-        with self.assertRaisesRegex(
-            RiftError, r"You must specifiy a file path \(-f\)"
-        ):
-            exit_code = main(['check', 'spec'])
-            self.assertEqual(exit_code, 1)
-
     @patch('rift.Controller.Mock')
     def test_check_spec(self, mock_mock):
         """simple check spec"""
@@ -468,7 +551,7 @@ class ControllerProjectActionValiddiffTest(RiftProjectTestCase):
 
     @patch('rift.Controller.remove_packages')
     @patch('rift.Controller.StagingRepository')
-    @patch('rift.package._project.PackageRPM', autospec=PackageRPM)
+    @patch('rift.package._project.PackageRPM')
     @patch('rift.Controller.get_packages_from_patch')
     def test_action_validdiff_formats(
             self,
@@ -482,19 +565,12 @@ class ControllerProjectActionValiddiffTest(RiftProjectTestCase):
         self.config.set('arch', ['x86_64', 'aarch64'])
         self.update_project_conf()
 
-        # Create fake package without build requirement
-        self.make_pkg(build_requires=[])
+        # Create fake package without build requirement and mock its
+        # PackageRPM and ActionableArchPackageRPM objects
+        mock_pkg_rpm_objs, mock_act_arch_pkg_rpm = setup_mock_pkg_rpm(
+            self, mock_pkg_rpm)
 
-        # Get PackageRPM instances mock
-        mock_pkg_rpm_objs = mock_pkg_rpm.return_value
-        PackageRPM.__init__(
-            mock_pkg_rpm_objs, 'pkg', self.config, self.staff, self.modules)
         mock_get_packages_from_patch.return_value = ([mock_pkg_rpm_objs], [])
-        # Make PackageRPM.supports_arch() return True for all archs
-        mock_pkg_rpm_objs.supports_arch.return_value = True
-        # Mock ActionableArchPackageRPM objects
-        mock_act_arch_pkg_rpm = Mock(spec=ActionableArchPackageRPM)
-        mock_pkg_rpm_objs.for_arch.return_value = mock_act_arch_pkg_rpm
         # Make ActionableArchPackageRPM.test() return empty but successful
         # test results.
         mock_act_arch_pkg_rpm.test.return_value = TestResults()
@@ -528,98 +604,72 @@ class ControllerProjectActionValiddiffTest(RiftProjectTestCase):
         mock_act_arch_pkg_rpm.clean.assert_has_calls(
             [call(noquit=False), call(noquit=False)])
 
-    @patch('rift.Controller.ProjectArchRepositories')
-    def test_remove_packages(self, mock_parepository_class):
-        """remove_packages() search, delete and update repository."""
-        mock_parepository_objects = mock_parepository_class.return_value
 
+class ControllerRemovePackagesTest(RiftProjectTestCase):
+    """
+    Tests class for Controller remove_packages()
+    """
+    def setUp(self):
+        super().setUp()
+        patcher = patch(
+            'rift.Controller.ProjectArchRepositories.delete_matching')
+        self.mock_delete_matching = patcher.start()
+        self.addCleanup(patcher.stop)
         # Enable publish arg
-        args = Mock()
-        args.publish = True
-
+        self.args = Mock()
+        self.args.publish = True
         # Define a list of packages to remove
-        pkgs_to_remove = [
+        self.pkgs_to_remove = [
             PackageVirtual('pkg', self.config, self.staff, self.modules)
         ]
-
         # Define working_repo in configuration
         self.config.options['working_repo'] = '/path/to/working/repo'
 
-        # Call remove_packages()
-        remove_packages(self.config, args, pkgs_to_remove, 'x86_64')
-
-        # Check ProjectArchRepository object has been instanciated
-        mock_parepository_class.assert_called()
+    def test_remove_packages(self):
+        """remove_packages() search, delete and update repository."""
+        remove_packages(self.config, self.args, self.pkgs_to_remove, 'x86_64')
         # Check ProjectArchRepository.delete_matching() has been called
-        mock_parepository_objects.delete_matching.assert_called_once_with(
-            pkgs_to_remove[0].name
+        self.mock_delete_matching.assert_called_once_with(
+            self.pkgs_to_remove[0].name
         )
 
-    @patch('rift.Controller.ProjectArchRepositories.delete_matching')
-    def test_remove_packages_noop(self, mock_delete_matching):
+    def test_remove_packages_noop(self):
         """remove_packages() is noop if no publish arg or no working_repo"""
-
-        pkgs_to_remove = [
-            PackageVirtual('pkg', self.config, self.staff, self.modules)
-        ]
-        args = Mock()
-
         # publish is False, remove_packages() must be noop
-        args.publish = False
-        self.config.options['working_repo'] = '/path/to/working/repo'
-        remove_packages(self.config, args, pkgs_to_remove, 'x86_64')
-        mock_delete_matching.assert_not_called()
+        self.args.publish = False
+        remove_packages(self.config, self.args, self.pkgs_to_remove, 'x86_64')
+        self.mock_delete_matching.assert_not_called()
 
         # working_repo is not defined, remove_packages() must be noop
-        args.publish = True
+        self.args.publish = True
         del self.config.options['working_repo']
-        remove_packages(self.config, args, pkgs_to_remove, 'x86_64')
-        mock_delete_matching.assert_not_called()
+        remove_packages(self.config, self.args, self.pkgs_to_remove, 'x86_64')
+        self.mock_delete_matching.assert_not_called()
 
 
 class ControllerProjectActionBuildTest(RiftProjectTestCase):
     """
     Tests class for Controller actions build, test and validate
     """
-    def _check_qemuuserstatic(self):
-        """Skip the test if none qemu-$arch-static executable is found for all
-        architectures declared in project configuration."""
-        if not any(
-            [
-                os.path.exists(f"/usr/bin/qemu-{arch}-static")
-                for arch in self.config.get('arch')
-            ]
-        ):
-            self.skipTest("qemu-user-static is not available")
-
     @patch('sys.stdout', new_callable=StringIO)
-    @patch('rift.package._project.PackageRPM', autospec=PackageRPM)
+    @patch('rift.package._project.PackageRPM')
     def test_action_build(self, mock_pkg_rpm, mock_stdout):
 
         # Declare supported archs.
         self.config.set('arch', ['x86_64', 'aarch64'])
 
-        # Create temporary working repo and register its deletion at exit
+        # Create temporary working repo and register its deletion at test
+        # cleanup
         working_repo = make_temp_dir()
-        atexit.register(shutil.rmtree, working_repo)
+        self.addCleanup(shutil.rmtree, working_repo, ignore_errors=True)
 
         self.config.set('working_repo', working_repo)
         self.update_project_conf()
 
-        # Create fake package without build requirement
-        self.make_pkg(build_requires=[])
-
-        # Get PackageRPM mock instances
-        mock_pkg_rpm_objs = mock_pkg_rpm.return_value
-        # Initialize PackageRPM object attributes
-        PackageRPM.__init__(
-            mock_pkg_rpm_objs, 'pkg', self.config, self.staff, self.modules)
-        # Make PackageRPM.supports_arch() return True for all archs
-        mock_pkg_rpm_objs.supports_arch.return_value = True
-
-        # Mock ActionableArchPackageRPM objects
-        mock_act_arch_pkg_rpm = Mock(spec=ActionableArchPackageRPM)
-        mock_pkg_rpm_objs.for_arch.return_value = mock_act_arch_pkg_rpm
+        # Create fake package without build requirement and mock its
+        # PackageRPM and ActionableArchPackageRPM objects
+        mock_pkg_rpm_objs, mock_act_arch_pkg_rpm = setup_mock_pkg_rpm(
+            self, mock_pkg_rpm)
 
         self.assertEqual(main(['build', 'pkg', '--publish']), 0)
 
@@ -630,11 +680,12 @@ class ControllerProjectActionBuildTest(RiftProjectTestCase):
 
         # Check actionable RPM package build(), publish() and clean() methods
         # are called for all supported arch (ie. twice).
-        mock_act_arch_pkg_rpm.build.assert_has_calls(
-            [call(sign=False, staging=None), call(sign=False, staging=None)])
-        mock_act_arch_pkg_rpm.publish.assert_has_calls(
-            [call(updaterepo=True), call(updaterepo=True)])
-        mock_act_arch_pkg_rpm.clean.assert_has_calls([call(), call()])
+        self.assertEqual(mock_act_arch_pkg_rpm.build.call_args_list,
+                         [call(sign=False, staging=None)] * 2)
+        self.assertEqual(mock_act_arch_pkg_rpm.publish.call_args_list,
+                         [call(updaterepo=True)] * 2)
+        self.assertEqual(mock_act_arch_pkg_rpm.clean.call_args_list,
+                         [call()] * 2)
 
         out = mock_stdout.getvalue()
         self.assertIn(
@@ -642,31 +693,17 @@ class ControllerProjectActionBuildTest(RiftProjectTestCase):
         self.assertIn(
             '** Build thread build-aarch64 output: **', out)
 
-        # Remove temporary working repo and unregister its deletion at exit
-        shutil.rmtree(working_repo)
-        atexit.unregister(shutil.rmtree)
-
-    @patch('rift.package._project.PackageRPM', autospec=PackageRPM)
+    @patch('rift.package._project.PackageRPM')
     def test_action_build_formats(self, mock_pkg_rpm):
 
         # Declare supported archs.
         self.config.set('arch', ['x86_64', 'aarch64'])
         self.update_project_conf()
 
-        # Create fake package without build requirement
-        self.make_pkg(build_requires=[])
-
-        # Get PackageRPM instances mock
-        mock_pkg_rpm_objs = mock_pkg_rpm.return_value
-        # Initialize PackageRPM object attributes
-        PackageRPM.__init__(
-            mock_pkg_rpm_objs, 'pkg', self.config, self.staff, self.modules)
-        # Make PackageRPM.supports_arch() return True for all archs
-        mock_pkg_rpm_objs.supports_arch.return_value = True
-
-        # Mock ActionableArchPackageRPM objects
-        mock_act_arch_pkg_rpm = Mock(spec=ActionableArchPackageRPM)
-        mock_pkg_rpm_objs.for_arch.return_value = mock_act_arch_pkg_rpm
+        # Create fake package without build requirement and mock its
+        # PackageRPM and ActionableArchPackageRPM objects
+        mock_pkg_rpm_objs, mock_act_arch_pkg_rpm = setup_mock_pkg_rpm(
+            self, mock_pkg_rpm)
 
         self.assertEqual(
             main(['build', 'pkg', '--formats', 'rpm']), 0)
@@ -682,16 +719,16 @@ class ControllerProjectActionBuildTest(RiftProjectTestCase):
             [call(sign=False, staging=None), call(sign=False, staging=None)])
         mock_act_arch_pkg_rpm.clean.assert_has_calls([call(), call()])
 
+    @skip_unless_functional_build
     def test_action_build_publish_functional(self):
         """Functional RPM build and publish test"""
-        # Declare supported archs and check qemu-user-static is available for
-        # these architectures or skip the test.
-        self.config.set('arch', ['x86_64', 'aarch64'])
-        self._check_qemuuserstatic()
+        # Declare supported archs.
+        self.config.set('arch', FUNCTIONAL_ARCHS)
 
-        # Create temporary working repo and register its deletion at exit
+        # Create temporary working repo and register its deletion at test
+        # cleanup
         working_repo = make_temp_dir()
-        atexit.register(shutil.rmtree, working_repo)
+        self.addCleanup(shutil.rmtree, working_repo, ignore_errors=True)
 
         self.config.set('working_repo', working_repo)
         self.config.options['repos'] = VALID_REPOS
@@ -709,20 +746,16 @@ class ControllerProjectActionBuildTest(RiftProjectTestCase):
         # Remove mock build environments
         self.clean_mock_environments()
 
-        # Remove temporary working repo and unregister its deletion at exit
-        shutil.rmtree(working_repo)
-        atexit.unregister(shutil.rmtree)
-
+    @skip_unless_functional_build
     def test_action_build_publish_variants_functional(self):
         """Functional RPM build and publish test with variants"""
-        # Declare supported archs and check qemu-user-static is available for
-        # these architectures or skip the test.
-        self.config.set('arch', ['x86_64', 'aarch64'])
-        self._check_qemuuserstatic()
+        # Declare supported archs.
+        self.config.set('arch', FUNCTIONAL_ARCHS)
 
-        # Create temporary working repo and register its deletion at exit
+        # Create temporary working repo and register its deletion at test
+        # cleanup
         working_repo = make_temp_dir()
-        atexit.register(shutil.rmtree, working_repo)
+        self.addCleanup(shutil.rmtree, working_repo, ignore_errors=True)
 
         self.config.set('working_repo', working_repo)
         self.config.options['repos'] = VALID_REPOS
@@ -743,26 +776,16 @@ class ControllerProjectActionBuildTest(RiftProjectTestCase):
         # Remove mock build environments
         self.clean_mock_environments()
 
-        # Remove temporary working repo and unregister its deletion at exit
-        shutil.rmtree(working_repo)
-        atexit.unregister(shutil.rmtree)
-
-    @patch('rift.package._project.PackageRPM', autospec=PackageRPM)
+    @patch('rift.package._project.PackageRPM')
     def test_action_build_load_failure(self, mock_pkg_rpm):
 
-        # Create fake package without build requirement
-        self.make_pkg(build_requires=[])
+        # Create fake package without build requirement and mock its
+        # PackageRPM and ActionableArchPackageRPM objects
+        mock_pkg_rpm_objs, mock_act_arch_pkg_rpm = setup_mock_pkg_rpm(
+            self, mock_pkg_rpm)
 
-        # Get PackageRPM mock instances
-        mock_pkg_rpm_objs = mock_pkg_rpm.return_value
-        # Initialize PackageRPM object attributes
-        PackageRPM.__init__(
-            mock_pkg_rpm_objs, 'pkg', self.config, self.staff, self.modules)
         # Make PackageRPM.load() raise RiftError
         mock_pkg_rpm_objs.load.side_effect = RiftError("fake load failure")
-        # Mock ActionableArchPackageRPM objects
-        mock_act_arch_pkg_rpm = Mock(spec=ActionableArchPackageRPM)
-        mock_pkg_rpm_objs.for_arch.return_value = mock_act_arch_pkg_rpm
 
         with self.assertLogs(level='ERROR') as log:
             # Check main returns non-zero exit code
@@ -778,24 +801,17 @@ class ControllerProjectActionBuildTest(RiftProjectTestCase):
         mock_act_arch_pkg_rpm.publish.assert_not_called()
         mock_act_arch_pkg_rpm.clean.assert_not_called()
 
-    @patch('rift.package._project.PackageRPM', autospec=PackageRPM)
+    @patch('rift.package._project.PackageRPM')
     def test_action_build_skip_unsupported_arch(self, mock_pkg_rpm):
 
         # Declare multiple supported archs.
         self.config.set('arch', ['x86_64', 'aarch64'])
         self.update_project_conf()
 
-        # Create fake package without build requirement
-        self.make_pkg(build_requires=[])
-
-        # Get PackageRPM mock instances
-        mock_pkg_rpm_objs = mock_pkg_rpm.return_value
-        # Initialize PackageRPM object attributes
-        PackageRPM.__init__(
-            mock_pkg_rpm_objs, 'pkg', self.config, self.staff, self.modules)
-        # Mock ActionableArchPackageRPM objects
-        mock_act_arch_pkg_rpm = Mock(spec=ActionableArchPackageRPM)
-        mock_pkg_rpm_objs.for_arch.return_value = mock_act_arch_pkg_rpm
+        # Create fake package without build requirement and mock its
+        # PackageRPM and ActionableArchPackageRPM objects
+        mock_pkg_rpm_objs, mock_act_arch_pkg_rpm = setup_mock_pkg_rpm(
+            self, mock_pkg_rpm)
 
         # Run build with PackageRPM.supports_arch() that returns True only for
         # x86_64.
@@ -816,31 +832,25 @@ class ControllerProjectActionBuildTest(RiftProjectTestCase):
             [call(sign=False, staging=None)])
         mock_act_arch_pkg_rpm.clean.assert_has_calls([call()])
 
-    @patch('rift.package._project.PackageRPM', autospec=PackageRPM)
+    @patch('rift.package._project.PackageRPM')
     def test_action_build_failure(self, mock_pkg_rpm):
 
         # Declare multiple supported archs.
         self.config.set('arch', ['x86_64', 'aarch64'])
 
-        # Create temporary working repo and register its deletion at exit
+        # Create temporary working repo and register its deletion at test
+        # cleanup
         working_repo = make_temp_dir()
-        atexit.register(shutil.rmtree, working_repo)
+        self.addCleanup(shutil.rmtree, working_repo, ignore_errors=True)
 
         self.config.set('working_repo', working_repo)
         self.update_project_conf()
 
-        # Create fake package without build requirement
-        self.make_pkg(build_requires=[])
-
-        # Get PackageRPM mock instances
-        mock_pkg_rpm_objs = mock_pkg_rpm.return_value
-        # Initialize PackageRPM object attributes
-        PackageRPM.__init__(
-            mock_pkg_rpm_objs, 'pkg', self.config, self.staff, self.modules)
+        # Create fake package without build requirement and mock its
+        # PackageRPM and ActionableArchPackageRPM objects
+        _, mock_act_arch_pkg_rpm = setup_mock_pkg_rpm(
+            self, mock_pkg_rpm)
 
-        # Mock ActionableArchPackageRPM objects
-        mock_act_arch_pkg_rpm = Mock(spec=ActionableArchPackageRPM)
-        mock_pkg_rpm_objs.for_arch.return_value = mock_act_arch_pkg_rpm
         mock_act_arch_pkg_rpm.build.side_effect = RiftError(
             "fake build failure")
 
@@ -864,25 +874,14 @@ class ControllerProjectActionBuildTest(RiftProjectTestCase):
         # build failures.
         mock_act_arch_pkg_rpm.publish.assert_not_called()
 
-        # Remove temporary working repo and unregister its deletion at exit
-        shutil.rmtree(working_repo)
-        atexit.unregister(shutil.rmtree)
-
     @patch('sys.stdout', new_callable=StringIO)
-    @patch('rift.package._project.PackageRPM', autospec=PackageRPM)
+    @patch('rift.package._project.PackageRPM')
     def test_action_build_quiet_success(
             self, mock_pkg_rpm, mock_stdout):
         """build --quiet does not print build output on success."""
         self.config.set('arch', ['x86_64', 'aarch64'])
         self.update_project_conf()
-        self.make_pkg(build_requires=[])
-
-        mock_pkg_rpm_objs = mock_pkg_rpm.return_value
-        PackageRPM.__init__(
-            mock_pkg_rpm_objs, 'pkg', self.config, self.staff, self.modules)
-        mock_pkg_rpm_objs.supports_arch.return_value = True
-        mock_act_arch_pkg_rpm = Mock(spec=ActionableArchPackageRPM)
-        mock_pkg_rpm_objs.for_arch.return_value = mock_act_arch_pkg_rpm
+        setup_mock_pkg_rpm(self, mock_pkg_rpm)
 
         self.assertEqual(
             main(['build', 'pkg', '--formats', 'rpm', '--quiet']), 0)
@@ -891,7 +890,7 @@ class ControllerProjectActionBuildTest(RiftProjectTestCase):
         self.assertNotIn('Build thread', out)
 
     @patch('sys.stdout', new_callable=StringIO)
-    @patch('rift.package._project.PackageRPM', autospec=PackageRPM)
+    @patch('rift.package._project.PackageRPM')
     @patch('rift.Controller.build_architecture')
     def test_action_build_quiet_failure(
         self,
@@ -903,11 +902,9 @@ class ControllerProjectActionBuildTest(RiftProjectTestCase):
 
         self.config.set('arch', ['x86_64'])
         self.update_project_conf()
-        self.make_pkg(build_requires=[])
-
-        mock_pkg_rpm_objs = mock_pkg_rpm.return_value
-        PackageRPM.__init__(
-            mock_pkg_rpm_objs, 'pkg', self.config, self.staff, self.modules)
+        # Create fake package without build requirement and mock its
+        # PackageRPM objects
+        setup_mock_pkg_rpm(self, mock_pkg_rpm)
 
         build_failed = TestResults('build-x86_64')
         build_failed.add_failure(
@@ -925,26 +922,17 @@ class ControllerProjectActionBuildTest(RiftProjectTestCase):
             mock_stdout.getvalue(),
         )
 
-    @patch('rift.package._project.PackageRPM', autospec=PackageRPM)
+    @patch('rift.package._project.PackageRPM')
     def test_action_test(self, mock_pkg_rpm):
 
         # Declare supported archs.
         self.config.set('arch', ['x86_64', 'aarch64'])
         self.update_project_conf()
 
-        # Create fake package without build requirement
-        self.make_pkg(build_requires=[])
-
-        # Get PackageRPM mock instances
-        mock_pkg_rpm_objs = mock_pkg_rpm.return_value
-        # Initialize PackageRPM object attributes
-        PackageRPM.__init__(
-            mock_pkg_rpm_objs, 'pkg', self.config, self.staff, self.modules)
-        # Make PackageRPM.supports_arch() return True for all archs
-        mock_pkg_rpm_objs.supports_arch.return_value = True
-        # Mock ActionableArchPackageRPM objects
-        mock_act_arch_pkg_rpm = Mock(spec=ActionableArchPackageRPM)
-        mock_pkg_rpm_objs.for_arch.return_value = mock_act_arch_pkg_rpm
+        # Create fake package without build requirement and mock its
+        # PackageRPM and ActionableArchPackageRPM objects
+        mock_pkg_rpm_objs, mock_act_arch_pkg_rpm = setup_mock_pkg_rpm(
+            self, mock_pkg_rpm)
         # Make ActionableArchPackageRPM.test() return empty but successful test
         # results.
         mock_act_arch_pkg_rpm.test.return_value = TestResults()
@@ -959,30 +947,20 @@ class ControllerProjectActionBuildTest(RiftProjectTestCase):
 
         # Check actionable RPM package test() method is called for all
         # supported arch (ie. twice).
-        mock_act_arch_pkg_rpm.test.assert_has_calls(
-            [call(noauto=False, noquit=False),
-             call(noauto=False, noquit=False)])
+        self.assertEqual(mock_act_arch_pkg_rpm.test.call_args_list,
+                         [call(noauto=False, noquit=False)] * 2)
 
-    @patch('rift.package._project.PackageRPM', autospec=PackageRPM)
+    @patch('rift.package._project.PackageRPM')
     def test_action_test_formats(self, mock_pkg_rpm):
 
         # Declare supported archs.
         self.config.set('arch', ['x86_64', 'aarch64'])
         self.update_project_conf()
 
-        # Create fake package without build requirement
-        self.make_pkg(build_requires=[])
-
-        # Get PackageRPM instances mock
-        mock_pkg_rpm_objs = mock_pkg_rpm.return_value
-        # Initialize PackageRPM object attributes
-        PackageRPM.__init__(
-            mock_pkg_rpm_objs, 'pkg', self.config, self.staff, self.modules)
-        # Make PackageRPM.supports_arch() return True for all archs
-        mock_pkg_rpm_objs.supports_arch.return_value = True
-        # Mock ActionableArchPackageRPM objects
-        mock_act_arch_pkg_rpm = Mock(spec=ActionableArchPackageRPM)
-        mock_pkg_rpm_objs.for_arch.return_value = mock_act_arch_pkg_rpm
+        # Create fake package without build requirement and mock its
+        # PackageRPM and ActionableArchPackageRPM objects
+        mock_pkg_rpm_objs, mock_act_arch_pkg_rpm = setup_mock_pkg_rpm(
+            self, mock_pkg_rpm)
         # Make ActionableArchPackageRPM.test() return empty but successful test
         # results.
         mock_act_arch_pkg_rpm.test.return_value = TestResults()
@@ -1001,22 +979,16 @@ class ControllerProjectActionBuildTest(RiftProjectTestCase):
             [call(noauto=False, noquit=False),
              call(noauto=False, noquit=False)])
 
-    @patch('rift.package._project.PackageRPM', autospec=PackageRPM)
+    @patch('rift.package._project.PackageRPM')
     def test_action_test_load_failure(self, mock_pkg_rpm):
 
-        # Create fake package without build requirement
-        self.make_pkg(build_requires=[])
+        # Create fake package without build requirement and mock its
+        # PackageRPM and ActionableArchPackageRPM objects
+        mock_pkg_rpm_objs, mock_act_arch_pkg_rpm = setup_mock_pkg_rpm(
+            self, mock_pkg_rpm)
 
-        # Get PackageRPM mock instances
-        mock_pkg_rpm_objs = mock_pkg_rpm.return_value
-        # Initialize PackageRPM object attributes
-        PackageRPM.__init__(
-            mock_pkg_rpm_objs, 'pkg', self.config, self.staff, self.modules)
         # Make PackageRPM.load() raise RiftError
         mock_pkg_rpm_objs.load.side_effect = RiftError("fake load failure")
-        # Mock ActionableArchPackageRPM objects
-        mock_act_arch_pkg_rpm = Mock(spec=ActionableArchPackageRPM)
-        mock_pkg_rpm_objs.for_arch.return_value = mock_act_arch_pkg_rpm
 
         with self.assertLogs(level='ERROR') as log:
             self.assertEqual(main(['test', 'pkg']), 2)
@@ -1026,24 +998,18 @@ class ControllerProjectActionBuildTest(RiftProjectTestCase):
         )
         mock_act_arch_pkg_rpm.test.assert_not_called()
 
-    @patch('rift.package._project.PackageRPM', autospec=PackageRPM)
+    @patch('rift.package._project.PackageRPM')
     def test_action_test_failure(self, mock_pkg_rpm):
 
         # Declare supported archs.
         self.config.set('arch', ['x86_64', 'aarch64'])
         self.update_project_conf()
 
-        # Create fake package without build requirement
-        self.make_pkg(build_requires=[])
+        # Create fake package without build requirement and mock its
+        # PackageRPM and ActionableArchPackageRPM objects
+        mock_pkg_rpm_objs, mock_act_arch_pkg_rpm = setup_mock_pkg_rpm(
+            self, mock_pkg_rpm)
 
-        # Get PackageRPM mock instances
-        mock_pkg_rpm_objs = mock_pkg_rpm.return_value
-        # Initialize PackageRPM object attributes
-        PackageRPM.__init__(
-            mock_pkg_rpm_objs, 'pkg', self.config, self.staff, self.modules)
-        # Mock ActionableArchPackageRPM objects
-        mock_act_arch_pkg_rpm = Mock(spec=ActionableArchPackageRPM)
-        mock_pkg_rpm_objs.for_arch.return_value = mock_act_arch_pkg_rpm
         # Make ActionableArchPackageRPM.test() return results with one failure.
         test_results = TestResults()
         test_results.add_failure(
@@ -1065,25 +1031,18 @@ class ControllerProjectActionBuildTest(RiftProjectTestCase):
             [call(noauto=False, noquit=False),
              call(noauto=False, noquit=False)])
 
-    @patch('rift.package._project.PackageRPM', autospec=PackageRPM)
+    @patch('rift.package._project.PackageRPM')
     def test_action_test_skip_unsupported_arch(self, mock_pkg_rpm):
 
         # Declare multiple supported archs.
         self.config.set('arch', ['x86_64', 'aarch64'])
         self.update_project_conf()
 
-        # Create fake package without build requirement
-        self.make_pkg(build_requires=[])
+        # Create fake package without build requirement and mock its
+        # PackageRPM and ActionableArchPackageRPM objects
+        mock_pkg_rpm_objs, mock_act_arch_pkg_rpm = setup_mock_pkg_rpm(
+            self, mock_pkg_rpm)
 
-        # Get PackageRPM mock instances
-        mock_pkg_rpm_objs = mock_pkg_rpm.return_value
-        # Initialize PackageRPM object attributes
-        PackageRPM.__init__(
-            mock_pkg_rpm_objs, 'pkg', self.config, self.staff, self.modules)
-
-        # Mock ActionableArchPackageRPM objects
-        mock_act_arch_pkg_rpm = Mock(spec=ActionableArchPackageRPM)
-        mock_pkg_rpm_objs.for_arch.return_value = mock_act_arch_pkg_rpm
         # Make ActionableArchPackageRPM.test() return empty but successful test
         # results.
         mock_act_arch_pkg_rpm.test.return_value = TestResults()
@@ -1108,26 +1067,17 @@ class ControllerProjectActionBuildTest(RiftProjectTestCase):
 
     @patch('sys.stdout', new_callable=StringIO)
     @patch('rift.Controller.StagingRepository')
-    @patch('rift.package._project.PackageRPM', autospec=PackageRPM)
+    @patch('rift.package._project.PackageRPM')
     def test_action_validate(self, mock_pkg_rpm, mock_staging_repo_cls, mock_stdout):
 
         # Declare supported archs.
         self.config.set('arch', ['x86_64', 'aarch64'])
         self.update_project_conf()
 
-        # Create fake package without build requirement
-        self.make_pkg(build_requires=[])
-
-        # Get PackageRPM mock instances
-        mock_pkg_rpm_objs = mock_pkg_rpm.return_value
-        # Initialize PackageRPM object attributes
-        PackageRPM.__init__(
-            mock_pkg_rpm_objs, 'pkg', self.config, self.staff, self.modules)
-        # Make PackageRPM.supports_arch() return True for all archs
-        mock_pkg_rpm_objs.supports_arch.return_value = True
-        # Mock ActionableArchPackageRPM objects
-        mock_act_arch_pkg_rpm = Mock(spec=ActionableArchPackageRPM)
-        mock_pkg_rpm_objs.for_arch.return_value = mock_act_arch_pkg_rpm
+        # Create fake package without build requirement and mock its
+        # PackageRPM and ActionableArchPackageRPM objects
+        mock_pkg_rpm_objs, mock_act_arch_pkg_rpm = setup_mock_pkg_rpm(
+            self, mock_pkg_rpm)
         # MakeActionableArchPackageRPM.test() return empty but successful test
         # results.
         mock_act_arch_pkg_rpm.test.return_value = TestResults()
@@ -1151,37 +1101,30 @@ class ControllerProjectActionBuildTest(RiftProjectTestCase):
 
         # Check RPM package check() method is called for all supported arch
         # (ie. twice).
-        mock_pkg_rpm_objs.check.assert_has_calls([call(), call()])
+        self.assertEqual(mock_pkg_rpm_objs.check.call_args_list, [call()] * 2)
 
         # Check actionable RPM package build(), publish(staging), test() and
         # clean() methods are called for all supported arch (ie. twice).
-        mock_act_arch_pkg_rpm.build.assert_has_calls(
-            [call(sign=False, staging=mock_staging_repo),
-             call(sign=False, staging=mock_staging_repo)])
-        mock_act_arch_pkg_rpm.publish.assert_has_calls(
-            [call(staging=mock_staging_repo), call(staging=mock_staging_repo)])
-        mock_act_arch_pkg_rpm.test.assert_has_calls(
-            [call(noauto=False, staging=mock_staging_repo, noquit=False),
-             call(noauto=False, staging=mock_staging_repo, noquit=False)])
-        mock_act_arch_pkg_rpm.clean.assert_has_calls(
-            [call(noquit=False), call(noquit=False)])
+        self.assertEqual(mock_act_arch_pkg_rpm.build.call_args_list,
+                         [call(sign=False, staging=mock_staging_repo)] * 2)
+        self.assertEqual(mock_act_arch_pkg_rpm.publish.call_args_list,
+                         [call(staging=mock_staging_repo)] * 2)
+        self.assertEqual(
+            mock_act_arch_pkg_rpm.test.call_args_list,
+            [call(noauto=False, staging=mock_staging_repo, noquit=False)] * 2)
+        self.assertEqual(mock_act_arch_pkg_rpm.clean.call_args_list,
+                         [call(noquit=False)] * 2)
 
     @patch('sys.stdout', new_callable=StringIO)
     @patch('rift.Controller.StagingRepository')
-    @patch('rift.package._project.PackageRPM', autospec=PackageRPM)
+    @patch('rift.package._project.PackageRPM')
     def test_action_validate_quiet_success(
             self, mock_pkg_rpm, mock_staging_repo_cls, mock_stdout):
         """validate --quiet does not print build output on success."""
         self.config.set('arch', ['x86_64', 'aarch64'])
         self.update_project_conf()
-        self.make_pkg(build_requires=[])
-
-        mock_pkg_rpm_objs = mock_pkg_rpm.return_value
-        PackageRPM.__init__(
-            mock_pkg_rpm_objs, 'pkg', self.config, self.staff, self.modules)
-        mock_pkg_rpm_objs.supports_arch.return_value = True
-        mock_act_arch_pkg_rpm = Mock(spec=ActionableArchPackageRPM)
-        mock_pkg_rpm_objs.for_arch.return_value = mock_act_arch_pkg_rpm
+        _, mock_act_arch_pkg_rpm = setup_mock_pkg_rpm(
+            self, mock_pkg_rpm)
         mock_act_arch_pkg_rpm.test.return_value = TestResults()
         mock_staging_repo = Mock()
         mock_staging_repo_cls.return_value = mock_staging_repo
@@ -1192,7 +1135,7 @@ class ControllerProjectActionBuildTest(RiftProjectTestCase):
         self.assertNotIn('Validate thread', out)
 
     @patch('sys.stdout', new_callable=StringIO)
-    @patch('rift.package._project.PackageRPM', autospec=PackageRPM)
+    @patch('rift.package._project.PackageRPM')
     @patch('rift.Controller.validate_pkgs')
     def test_action_validate_quiet_failure(
             self,
@@ -1211,11 +1154,9 @@ class ControllerProjectActionBuildTest(RiftProjectTestCase):
 
         self.config.set('arch', ['x86_64'])
         self.update_project_conf()
-        self.make_pkg(build_requires=[])
-
-        mock_pkg_rpm_objs = mock_pkg_rpm.return_value
-        PackageRPM.__init__(
-            mock_pkg_rpm_objs, 'pkg', self.config, self.staff, self.modules)
+        # Create fake package without build requirement and mock its
+        # PackageRPM objects
+        setup_mock_pkg_rpm(self, mock_pkg_rpm)
 
         self.assertEqual(main(['validate', 'pkg', '--quiet']), 2)
 
@@ -1224,70 +1165,49 @@ class ControllerProjectActionBuildTest(RiftProjectTestCase):
             mock_stdout.getvalue(),
         )
 
-    @patch('rift.Controller.PackagesDependencyGraph')
-    def test_build_graph(self, mock_graph_class):
-        """ Test build generates graph of packages dependencies with dependency tracking enabled. """
-        # Enable dependency tracking in configuration
-        self.config.set('dependency_tracking', True)
-        self.update_project_conf()
-        main(['build', 'pkg'])
-        mock_graph_class.from_project.assert_called_once()
-
-    @patch('rift.Controller.ProjectPackages')
-    @patch('rift.Controller.PackagesDependencyGraph')
-    def test_build_graph_tracking_disabled(self, mock_graph_class, mock_project_packages_class):
-        """ Test build does not build graph of packages dependencies with dependency tracking disabled. """
-        # Return empty list of packages with Package.list() to avoid actual
-        # build iterations.
-        mock_project_packages_class.list.return_value = []
-        # By default, dependency tracking is disabled
-        main(['build', 'pkg'])
-        mock_graph_class.from_project.assert_not_called()
-
-    @patch('rift.Controller.ProjectPackages')
-    @patch('rift.Controller.PackagesDependencyGraph')
-    def test_build_graph_skip_deps(self, mock_graph_class, mock_project_packages_class):
-        """ Test build --skip-deps does not build graph of packages dependencies. """
+    def _check_graph(self, action, mock_graph_class, mock_project_packages_class):
+        """
+        Check action generates graph of packages dependencies with dependency
+        tracking enabled only, and never with --skip-deps.
+        """
         # Return empty list of packages with Package.list() to avoid actual
         # build iterations.
         mock_project_packages_class.list.return_value = []
-        # Enable dependency tracking in configuration
-        self.config.set('dependency_tracking', True)
-        self.update_project_conf()
-        main(['build', '--skip-deps', 'pkg'])
-        mock_graph_class.from_project.assert_not_called()
-
-    @patch('rift.Controller.PackagesDependencyGraph')
-    def test_validate_graph(self, mock_graph_class):
-        """ Test validate generates graph of packages dependencies with dependency tracking enabled. """
-        # Enable dependency tracking in configuration
-        self.config.set('dependency_tracking', True)
-        self.update_project_conf()
-        main(['validate', 'pkg'])
-        mock_graph_class.from_project.assert_called_once()
+        # Tuples of (dependency tracking, --skip-deps, graph expected). When
+        # dependency tracking is None, it is not defined in configuration and
+        # the default value (disabled) applies.
+        for tracking, skip_deps, expected in (
+                (None, False, False),
+                (True, False, True),
+                (True, True, False),
+        ):
+            with self.subTest(tracking=tracking, skip_deps=skip_deps):
+                mock_graph_class.reset_mock()
+                if tracking is None:
+                    self.config.options.pop('dependency_tracking', None)
+                else:
+                    self.config.set('dependency_tracking', tracking)
+                self.update_project_conf()
+                cmd = [action, 'pkg']
+                if skip_deps:
+                    cmd.insert(1, '--skip-deps')
+                main(cmd)
+                if expected:
+                    mock_graph_class.from_project.assert_called_once()
+                else:
+                    mock_graph_class.from_project.assert_not_called()
 
     @patch('rift.Controller.ProjectPackages')
     @patch('rift.Controller.PackagesDependencyGraph')
-    def test_validate_graph_tracking_disabled(self, mock_graph_class, mock_project_packages_class):
-        """ Test validate does not build graph of packages dependencies with dependency tracking disabled. """
-        # Return empty list of packages with Package.list() to avoid actual
-        # build iterations.
-        mock_project_packages_class.list.return_value = []
-        # By default, dependency tracking is disabled
-        main(['validate', 'pkg'])
-        mock_graph_class.from_project.assert_not_called()
+    def test_build_graph(self, mock_graph_class, mock_project_packages_class):
+        """ Test build generates graph of packages dependencies only with dependency tracking enabled and without --skip-deps. """
+        self._check_graph('build', mock_graph_class, mock_project_packages_class)
 
     @patch('rift.Controller.ProjectPackages')
     @patch('rift.Controller.PackagesDependencyGraph')
-    def test_validate_graph_skip_deps(self, mock_graph_class, mock_project_packages_class):
-        """ Test validate --skip-deps does not build graph of packages dependencies. """
-        # Return empty list of packages with Package.list() to avoid actual
-        # build iterations.
-        mock_project_packages_class.list.return_value = []
-        self.config.set('dependency_tracking', True)
-        self.update_project_conf()
-        main(['validate', '--skip-deps', 'pkg'])
-        mock_graph_class.from_project.assert_not_called()
+    def test_validate_graph(self, mock_graph_class, mock_project_packages_class):
+        """ Test validate generates graph of packages dependencies only with dependency tracking enabled and without --skip-deps. """
+        self._check_graph('validate', mock_graph_class, mock_project_packages_class)
 
     def test_get_packages_to_build_tracking_disabled(self):
         """ Test get_packages_to_build() with tracking disabled (by default) returns user provided packages. """
@@ -1326,7 +1246,8 @@ class ControllerProjectActionBuildTest(RiftProjectTestCase):
     @patch('rift.package.rpm.Mock')
     def test_get_packages_to_build_package_order(self, mock_mock):
         """ Test get_packages_to_build() returns correctly ordered list of reverse dependencies. """
-        self.make_pkg(
+        make_pkg = self.make_pkg
+        make_pkg(
             name='libone',
             build_requires=['libtwo-devel'],
             subpackages=[
@@ -1334,26 +1255,27 @@ class ControllerProjectActionBuildTest(RiftProjectTestCase):
                 SubPackage('libone-devel')
             ]
         )
-        self.make_pkg(
+        make_pkg(
             name='libtwo',
             subpackages=[
                 SubPackage('libtwo-bin'),
                 SubPackage('libtwo-devel')
             ]
         )
-        self.make_pkg(
+        make_pkg(
             name='my-software',
             build_requires=['libone-devel, libtwo-devel']
         )
         # Enable tracking, disable --skip-deps
-        self.config.set('dependency_tracking', True)
+        config, staff, modules = self.config, self.staff, self.modules
+        config.set('dependency_tracking', True)
         args = Mock()
         args.skip_deps = False
         args.packages = ['libone']
         # mock Mock.read_spec to return spec file content directly read on host
         mock_mock.return_value.read_spec = read_file
         pkgs = get_packages_to_build(
-            self.config, self.staff, self.modules, args
+            config, staff, modules, args
         )
         self.assertEqual(
             [pkg.name for pkg in pkgs], ['libone', 'my-software']
@@ -1361,7 +1283,7 @@ class ControllerProjectActionBuildTest(RiftProjectTestCase):
         args.skip_deps = False
         args.packages = ['libone', 'libtwo']
         pkgs = get_packages_to_build(
-            self.config, self.staff, self.modules, args
+            config, staff, modules, args
         )
         # Package libone must be present after libtwo and my-software must be
         # present after both libtwo and libone in the order list of build
@@ -1402,39 +1324,34 @@ class ControllerProjectActionBuildTest(RiftProjectTestCase):
             pkgs = get_packages_to_build(
                 self.config, self.staff, self.modules, args
             )
-        # Package libone must be present after libtwo and my-software must be
-        # present after both libtwo and libone in the order list of build
-        # requirements.
-        self.assertCountEqual(
-            [pkg.name for pkg in pkgs], ['libthree', 'libtwo', 'libone']
+        # Packages in the loop are ordered as they are discovered from libone,
+        # following their reverse dependencies. As each package has a single
+        # reverse dependency, this order does not depend on the order of
+        # packages in project directory.
+        self.assertEqual(
+            [pkg.name for pkg in pkgs], ['libone', 'libthree', 'libtwo']
         )
-        self.assertIn(
-            'DEBUG:root:       ⥀ Loop detected on node rpm:libone at depth 2: '
-            'rpm:libone→rpm:libthree→rpm:libtwo→rpm:libone',
-            cm.output
+        # The loop is reported once.
+        self.assertEqual(
+            [line for line in cm.output if 'loop detected' in line],
+            [
+                'DEBUG:root:⥀ Dependency loop detected between packages: '
+                'rpm:libone, rpm:libthree, rpm:libtwo'
+            ]
         )
 
     @patch('rift.Controller.StagingRepository')
-    @patch('rift.package._project.PackageRPM', autospec=PackageRPM)
+    @patch('rift.package._project.PackageRPM')
     def test_action_validate_formats(self, mock_pkg_rpm, mock_staging_repo_cls):
 
         # Declare supported archs.
         self.config.set('arch', ['x86_64', 'aarch64'])
         self.update_project_conf()
 
-        # Create fake package without build requirement
-        self.make_pkg(build_requires=[])
-
-        # Get PackageRPM instances mock
-        mock_pkg_rpm_objs = mock_pkg_rpm.return_value
-        # Initialize PackageRPM object attributes
-        PackageRPM.__init__(
-            mock_pkg_rpm_objs, 'pkg', self.config, self.staff, self.modules)
-        # Make PackageRPM.supports_arch() return True for all archs
-        mock_pkg_rpm_objs.supports_arch.return_value = True
-        # Mock ActionableArchPackageRPM objects
-        mock_act_arch_pkg_rpm = Mock(spec=ActionableArchPackageRPM)
-        mock_pkg_rpm_objs.for_arch.return_value = mock_act_arch_pkg_rpm
+        # Create fake package without build requirement and mock its
+        # PackageRPM and ActionableArchPackageRPM objects
+        mock_pkg_rpm_objs, mock_act_arch_pkg_rpm = setup_mock_pkg_rpm(
+            self, mock_pkg_rpm)
         # MakeActionableArchPackageRPM.test() return empty but successful test
         # results.
         mock_act_arch_pkg_rpm.test.return_value = TestResults()
@@ -1467,22 +1384,16 @@ class ControllerProjectActionBuildTest(RiftProjectTestCase):
         mock_act_arch_pkg_rpm.clean.assert_has_calls(
             [call(noquit=False), call(noquit=False)])
 
-    @patch('rift.package._project.PackageRPM', autospec=PackageRPM)
+    @patch('rift.package._project.PackageRPM')
     def test_action_validate_load_failure(self, mock_pkg_rpm):
 
-        # Create fake package without build requirement
-        self.make_pkg(build_requires=[])
+        # Create fake package without build requirement and mock its
+        # PackageRPM and ActionableArchPackageRPM objects
+        mock_pkg_rpm_objs, mock_act_arch_pkg_rpm = setup_mock_pkg_rpm(
+            self, mock_pkg_rpm)
 
-        # Get PackageRPM mock instances
-        mock_pkg_rpm_objs = mock_pkg_rpm.return_value
-        # Initialize PackageRPM object attributes
-        PackageRPM.__init__(
-            mock_pkg_rpm_objs, 'pkg', self.config, self.staff, self.modules)
         # Make PackageRPM.load() raise RiftError
         mock_pkg_rpm_objs.load.side_effect = RiftError("fake load failure")
-        # Mock ActionableArchPackageRPM objects
-        mock_act_arch_pkg_rpm = Mock(spec=ActionableArchPackageRPM)
-        mock_pkg_rpm_objs.for_arch.return_value = mock_act_arch_pkg_rpm
 
         with self.assertLogs(level='ERROR') as log:
             self.assertEqual(main(['validate', 'pkg']), 2)
@@ -1501,28 +1412,20 @@ class ControllerProjectActionBuildTest(RiftProjectTestCase):
         mock_act_arch_pkg_rpm.test.assert_not_called()
         mock_act_arch_pkg_rpm.clean.assert_not_called()
 
-    @patch('rift.package._project.PackageRPM', autospec=PackageRPM)
+    @patch('rift.package._project.PackageRPM')
     def test_action_validate_check_failure(self, mock_pkg_rpm):
 
         # Declare multiple supported archs.
         self.config.set('arch', ['x86_64', 'aarch64'])
         self.update_project_conf()
 
-        # Create fake package without build requirement
-        self.make_pkg(build_requires=[])
+        # Create fake package without build requirement and mock its
+        # PackageRPM and ActionableArchPackageRPM objects
+        mock_pkg_rpm_objs, mock_act_arch_pkg_rpm = setup_mock_pkg_rpm(
+            self, mock_pkg_rpm)
 
-        # Get PackageRPM mock instances
-        mock_pkg_rpm_objs = mock_pkg_rpm.return_value
-        # Initialize PackageRPM object attributes
-        PackageRPM.__init__(
-            mock_pkg_rpm_objs, 'pkg', self.config, self.staff, self.modules)
-        # Make PackageRPM.supports_arch() return True for all archs
-        mock_pkg_rpm_objs.supports_arch.return_value = True
         # Make PackageRPM.check() raise RiftError
         mock_pkg_rpm_objs.check.side_effect = RiftError("fake check failure")
-        # Mock ActionableArchPackageRPM objects
-        mock_act_arch_pkg_rpm = Mock(spec=ActionableArchPackageRPM)
-        mock_pkg_rpm_objs.for_arch.return_value = mock_act_arch_pkg_rpm
 
         with self.assertLogs(level='ERROR') as log:
             self.assertEqual(main(['validate', 'pkg']), 2)
@@ -1544,29 +1447,21 @@ class ControllerProjectActionBuildTest(RiftProjectTestCase):
         mock_act_arch_pkg_rpm.clean.assert_not_called()
 
     @patch('rift.Controller.StagingRepository')
-    @patch('rift.package._project.PackageRPM', autospec=PackageRPM)
+    @patch('rift.package._project.PackageRPM')
     def test_action_validate_build_failure(self, mock_pkg_rpm, mock_staging_repo_cls):
 
         # Declare multiple supported archs.
         self.config.set('arch', ['x86_64', 'aarch64'])
         self.update_project_conf()
 
-        # Create fake package without build requirement
-        self.make_pkg(build_requires=[])
+        # Create fake package without build requirement and mock its
+        # PackageRPM and ActionableArchPackageRPM objects
+        mock_pkg_rpm_objs, mock_act_arch_pkg_rpm = setup_mock_pkg_rpm(
+            self, mock_pkg_rpm)
 
-        # Get PackageRPM mock instances
-        mock_pkg_rpm_objs = mock_pkg_rpm.return_value
-        # Initialize PackageRPM object attributes
-        PackageRPM.__init__(
-            mock_pkg_rpm_objs, 'pkg', self.config, self.staff, self.modules)
-        # Make PackageRPM.supports_arch() return True for all archs
-        mock_pkg_rpm_objs.supports_arch.return_value = True
         # Mock StagingRepository object.
         mock_staging_repo = Mock()
         mock_staging_repo_cls.return_value = mock_staging_repo
-        # Mock ActionableArchPackageRPM objects
-        mock_act_arch_pkg_rpm = Mock(spec=ActionableArchPackageRPM)
-        mock_pkg_rpm_objs.for_arch.return_value = mock_act_arch_pkg_rpm
         mock_act_arch_pkg_rpm.build.side_effect = RiftError(
             "fake build failure")
 
@@ -1599,29 +1494,21 @@ class ControllerProjectActionBuildTest(RiftProjectTestCase):
 
 
     @patch('rift.Controller.StagingRepository')
-    @patch('rift.package._project.PackageRPM', autospec=PackageRPM)
+    @patch('rift.package._project.PackageRPM')
     def test_action_validate_test_failure(self, mock_pkg_rpm, mock_staging_repo_cls):
 
         # Declare supported archs.
         self.config.set('arch', ['x86_64', 'aarch64'])
         self.update_project_conf()
 
-        # Create fake package without build requirement
-        self.make_pkg(build_requires=[])
+        # Create fake package without build requirement and mock its
+        # PackageRPM and ActionableArchPackageRPM objects
+        mock_pkg_rpm_objs, mock_act_arch_pkg_rpm = setup_mock_pkg_rpm(
+            self, mock_pkg_rpm)
 
-        # Get PackageRPM mock instances
-        mock_pkg_rpm_objs = mock_pkg_rpm.return_value
-        # Initialize PackageRPM object attributes
-        PackageRPM.__init__(
-            mock_pkg_rpm_objs, 'pkg', self.config, self.staff, self.modules)
-        # Make PackageRPM.supports_arch() return True for all archs
-        mock_pkg_rpm_objs.supports_arch.return_value = True
         # Mock StagingRepository object.
         mock_staging_repo = Mock()
         mock_staging_repo_cls.return_value = mock_staging_repo
-        # Mock ActionableArchPackageRPM objects
-        mock_act_arch_pkg_rpm = Mock(spec=ActionableArchPackageRPM)
-        mock_pkg_rpm_objs.for_arch.return_value = mock_act_arch_pkg_rpm
         # Make ActionableArchPackageRPM.test() return results with one failure.
         test_results = TestResults()
         test_results.add_failure(
@@ -1655,7 +1542,7 @@ class ControllerProjectActionBuildTest(RiftProjectTestCase):
             [call(noquit=False), call(noquit=False)])
 
     @patch('rift.Controller.StagingRepository')
-    @patch('rift.package._project.PackageRPM', autospec=PackageRPM)
+    @patch('rift.package._project.PackageRPM')
     def test_action_validate_skip_unsupported_arch(
         self, mock_pkg_rpm, mock_staging_repo_cls
     ):
@@ -1664,18 +1551,11 @@ class ControllerProjectActionBuildTest(RiftProjectTestCase):
         self.config.set('arch', ['x86_64', 'aarch64'])
         self.update_project_conf()
 
-        # Create fake package without build requirement
-        self.make_pkg(build_requires=[])
+        # Create fake package without build requirement and mock its
+        # PackageRPM and ActionableArchPackageRPM objects
+        mock_pkg_rpm_objs, mock_act_arch_pkg_rpm = setup_mock_pkg_rpm(
+            self, mock_pkg_rpm)
 
-        # Get PackageRPM mock instances
-        mock_pkg_rpm_objs = mock_pkg_rpm.return_value
-        # Initialize PackageRPM object attributes
-        PackageRPM.__init__(
-            mock_pkg_rpm_objs, 'pkg', self.config, self.staff, self.modules)
-
-        # Mock ActionableArchPackageRPM objects
-        mock_act_arch_pkg_rpm = Mock(spec=ActionableArchPackageRPM)
-        mock_pkg_rpm_objs.for_arch.return_value = mock_act_arch_pkg_rpm
         # Mock StagingRepository object.
         mock_staging_repo = Mock()
         mock_staging_repo_cls.return_value = mock_staging_repo
@@ -1711,32 +1591,24 @@ class ControllerProjectActionBuildTest(RiftProjectTestCase):
         mock_act_arch_pkg_rpm.clean.assert_has_calls([call(noquit=False)])
 
     @patch('rift.Controller.StagingRepository')
-    @patch('rift.package._project.PackageRPM', autospec=PackageRPM)
+    @patch('rift.package._project.PackageRPM')
     def test_action_validate_publish(self, mock_pkg_rpm, mock_staging_repo_cls):
 
         # Declare supported archs.
         self.config.set('arch', ['x86_64', 'aarch64'])
 
-        # Create temporary working repo and register its deletion at exit
+        # Create temporary working repo and register its deletion at test
+        # cleanup
         working_repo = make_temp_dir()
-        atexit.register(shutil.rmtree, working_repo)
+        self.addCleanup(shutil.rmtree, working_repo, ignore_errors=True)
 
         self.config.set('working_repo', working_repo)
         self.update_project_conf()
 
-        # Create fake package without build requirement
-        self.make_pkg(build_requires=[])
-
-        # Get PackageRPM mock instances
-        mock_pkg_rpm_objs = mock_pkg_rpm.return_value
-        # Initialize PackageRPM object attributes
-        PackageRPM.__init__(
-            mock_pkg_rpm_objs, 'pkg', self.config, self.staff, self.modules)
-        # Make PackageRPM.supports_arch() return True for all archs
-        mock_pkg_rpm_objs.supports_arch.return_value = True
-        # Mock ActionableArchPackageRPM objects
-        mock_act_arch_pkg_rpm = Mock(spec=ActionableArchPackageRPM)
-        mock_pkg_rpm_objs.for_arch.return_value = mock_act_arch_pkg_rpm
+        # Create fake package without build requirement and mock its
+        # PackageRPM and ActionableArchPackageRPM objects
+        _, mock_act_arch_pkg_rpm = setup_mock_pkg_rpm(
+            self, mock_pkg_rpm)
         # Mock StagingRepository object.
         mock_staging_repo = Mock()
         mock_staging_repo_cls.return_value = mock_staging_repo
@@ -1755,12 +1627,8 @@ class ControllerProjectActionBuildTest(RiftProjectTestCase):
              call(staging=mock_staging_repo),
              call()])
 
-        # Remove temporary working repo and unregister its deletion at exit
-        shutil.rmtree(working_repo)
-        atexit.unregister(shutil.rmtree)
-
     @patch('rift.Controller.StagingRepository')
-    @patch('rift.package._project.PackageRPM', autospec=PackageRPM)
+    @patch('rift.package._project.PackageRPM')
     def test_action_validate_publish_test_failure(
         self, mock_pkg_rpm, mock_staging_repo_cls
     ):
@@ -1768,26 +1636,18 @@ class ControllerProjectActionBuildTest(RiftProjectTestCase):
         # Declare supported archs.
         self.config.set('arch', ['x86_64', 'aarch64'])
 
-        # Create temporary working repo and register its deletion at exit
+        # Create temporary working repo and register its deletion at test
+        # cleanup
         working_repo = make_temp_dir()
-        atexit.register(shutil.rmtree, working_repo)
+        self.addCleanup(shutil.rmtree, working_repo, ignore_errors=True)
 
         self.config.set('working_repo', working_repo)
         self.update_project_conf()
 
-        # Create fake package without build requirement
-        self.make_pkg(build_requires=[])
-
-        # Get PackageRPM mock instances
-        mock_pkg_rpm_objs = mock_pkg_rpm.return_value
-        # Initialize PackageRPM object attributes
-        PackageRPM.__init__(
-            mock_pkg_rpm_objs, 'pkg', self.config, self.staff, self.modules)
-        # Make PackageRPM.supports_arch() return True for all archs
-        mock_pkg_rpm_objs.supports_arch.return_value = True
-        # Mock ActionableArchPackageRPM objects
-        mock_act_arch_pkg_rpm = Mock(spec=ActionableArchPackageRPM)
-        mock_pkg_rpm_objs.for_arch.return_value = mock_act_arch_pkg_rpm
+        # Create fake package without build requirement and mock its
+        # PackageRPM and ActionableArchPackageRPM objects
+        _, mock_act_arch_pkg_rpm = setup_mock_pkg_rpm(
+            self, mock_pkg_rpm)
         # Mock StagingRepository object.
         mock_staging_repo = Mock()
         mock_staging_repo_cls.return_value = mock_staging_repo
@@ -1807,10 +1667,6 @@ class ControllerProjectActionBuildTest(RiftProjectTestCase):
         mock_act_arch_pkg_rpm.publish.assert_has_calls(
             [call(staging=mock_staging_repo), call(staging=mock_staging_repo)])
 
-        # Remove temporary working repo and unregister its deletion at exit
-        shutil.rmtree(working_repo)
-        atexit.unregister(shutil.rmtree)
-
 
 class ControllerProjectActionVMTest(RiftProjectTestCase):
     """
@@ -1824,26 +1680,24 @@ class ControllerProjectActionVMTest(RiftProjectTestCase):
         main(['vm', 'connect'])
 
         # Define multiple supported architectures.
-        self.config.set('arch', ['x86_64', 'aarch64'])
-        self.update_project_conf()
-
-        # With multiple supported architectures, --arch argument must be
-        # required.
-        with self.assertRaisesRegex(
-            RiftError,
-            "^VM architecture must be defined with --arch argument.*$"
-        ):
-            main(['vm', 'connect'])
-
-        # It should run without error with --arch.
-        main(['vm', '--arch', 'x86_64', 'connect'])
-
-        # Test invalid value of --arch argument is reported.
-        with self.assertRaisesRegex(
-            RiftError,
-            "^Project does not support architecture 'fail'$"
-        ):
-            main(['vm', '--arch', 'fail', 'connect'])
+        with self.config_override({'arch': ['x86_64', 'aarch64']}):
+            # With multiple supported architectures, --arch argument must be
+            # required.
+            with self.assertRaisesRegex(
+                RiftError,
+                "^VM architecture must be defined with --arch argument.*$"
+            ):
+                main(['vm', 'connect'])
+
+            # It should run without error with --arch.
+            main(['vm', '--arch', 'x86_64', 'connect'])
+
+            # Test invalid value of --arch argument is reported.
+            with self.assertRaisesRegex(
+                RiftError,
+                "^Project does not support architecture 'fail'$"
+            ):
+                main(['vm', '--arch', 'fail', 'connect'])
 
         # Remove mock build environment
         self.clean_mock_environments()
@@ -1856,30 +1710,21 @@ class ControllerProjectActionVMTest(RiftProjectTestCase):
         mock_vm_objects.image_is_remote.return_value = False
         mock_vm_objects.image_local = 'test.qcow2'
 
-        main(['vm', 'build', 'http://image', '--deploy'])
+        # Arguments and expected VM.build() force, keep and output arguments
+        for args, force, keep, output in (
+            (['--deploy'], False, False, 'test.qcow2'),
+            (['--deploy', '--force'], True, False, 'test.qcow2'),
+            (['--deploy', '--keep'], False, True, 'test.qcow2'),
+            (['--output', 'OUTPUT.img', '--force'], True, False, 'OUTPUT.img'),
+        ):
+            with self.subTest(args=args):
+                mock_vm_objects.build.reset_mock()
+                main(['vm', 'build', 'http://image'] + args)
+                mock_vm_objects.build.assert_called_once_with(
+                    'http://image', force, keep, output
+                )
         # check VM class has been instanciated
         mock_vm_class.assert_called()
-
-        mock_vm_objects.build.assert_called_once_with(
-            'http://image', False, False, 'test.qcow2'
-        )
-        mock_vm_objects.build.reset_mock()
-        main(['vm', 'build', 'http://image', '--deploy', '--force'])
-        mock_vm_objects.build.assert_called_once_with(
-            'http://image', True, False, 'test.qcow2'
-        )
-        mock_vm_objects.build.reset_mock()
-        main(['vm', 'build', 'http://image', '--deploy', '--keep'])
-        mock_vm_objects.build.assert_called_once_with(
-            'http://image', False, True, 'test.qcow2'
-        )
-        mock_vm_objects.build.reset_mock()
-        main(
-            ['vm', 'build', 'http://image', '--output', 'OUTPUT.img', '--force']
-        )
-        mock_vm_objects.build.assert_called_once_with(
-            'http://image', True, False, 'OUTPUT.img'
-        )
         mock_vm_objects.build.reset_mock()
         with self.assertRaisesRegex(
             RiftError, "^Either --deploy or -o,--output option must be used$"
@@ -1968,10 +1813,26 @@ class ControllerProjectActionSignTest(RiftProjectTestCase):
     """
     Tests class for Controller action sign
     """
-    def test_action_sign(self):
-        """ Test sign package """
+    @patch('rift.Controller.RPM')
+    def test_action_sign(self, mock_rpm_class):
+        """ Test sign action signs all packages in arguments """
+        bin_rpm = f"{MATERIALS_DIR}/pkg-1.0-1.noarch.rpm"
+        src_rpm = f"{MATERIALS_DIR}/pkg-1.0-1.src.rpm"
+        self.assertEqual(main(['sign', bin_rpm, src_rpm]), 0)
+        self.assertEqual(
+            [args[0] for args, _ in mock_rpm_class.call_args_list],
+            [bin_rpm, src_rpm]
+        )
+        self.assertEqual(mock_rpm_class.return_value.sign.call_count, 2)
+
+    @skip_unless_functional
+    def test_action_sign_functional(self):
+        """ Test sign package with generated GPG key """
         gpg_home = os.path.join(self.projdir, '.gnupg')
 
+        # Copy keyring generated once for all tests
+        copy_gpg_keyring(gpg_home)
+
         # Launch GPG agent for this test
         cmd = [
           'gpg-agent',
@@ -1981,39 +1842,20 @@ class ControllerProjectActionSignTest(RiftProjectTestCase):
         ]
         subprocess.run(cmd)
 
-        # Generate keyring
-        gpg_key = 'rift'
-        cmd = [
-            'gpg',
-            '--homedir',
-            gpg_home,
-            '--batch',
-            '--passphrase',
-            '',
-            '--quick-generate-key',
-            gpg_key,
-        ]
-        subprocess.run(cmd)
-
-        # Update project configuration with generated key
+        # Update project configuration with copied key
         self.config.options.update(
             {
                 'gpg': {
                     'keyring': gpg_home,
-                    'key': gpg_key,
+                    'key': GPG_KEY,
                 }
             }
         )
         self.update_project_conf()
 
         # Path of RPM packages assets
-        tests_dir = os.path.dirname(os.path.abspath(__file__))
-        original_bin_rpm = os.path.join(
-            tests_dir, 'materials', 'pkg-1.0-1.noarch.rpm'
-        )
-        original_src_rpm = os.path.join(
-            tests_dir, 'materials', 'pkg-1.0-1.src.rpm'
-        )
+        original_bin_rpm = f"{MATERIALS_DIR}/pkg-1.0-1.noarch.rpm"
+        original_src_rpm = f"{MATERIALS_DIR}/pkg-1.0-1.src.rpm"
 
         # Copy RPM packages assets in temporary project directory
         copy_bin_rpm = os.path.join(self.projdir, os.path.basename(original_bin_rpm))
@@ -2053,16 +1895,36 @@ class ControllerProjectActionSyncTest(RiftProjectTestCase):
     """
     Tests class for Controller action sync
     """
+    def _run_sync(self, repos, cmd=None, archs=None, sync_output=None):
+        """
+        Update project configuration with the given repositories and
+        optionally architectures and synchronization output directory, then
+        run sync action with the given command line.
+        """
+        options = {'repos': repos}
+        if archs is not None:
+            options['arch'] = archs
+        if sync_output is not None:
+            options['sync_output'] = sync_output
+        with self.config_override(options):
+            return main(cmd or ['sync'])
+
+    def _make_sync_output(self):
+        """
+        Create temporary synchronization output parent directory, register its
+        deletion at test cleanup and return the path of the synchronization
+        output directory in this parent.
+        """
+        sync_parent = make_temp_dir()
+        self.addCleanup(shutil.rmtree, sync_parent, ignore_errors=True)
+        return os.path.join(sync_parent, 'output')
+
     @patch('rift.sync.RepoSyncBase.run')
     @patch('sys.stdout', new_callable=StringIO)
     def test_action_sync_skip_repo_wo_params(self, mock_stdout, mock_reposyncbase_run):
         """ Test rift runs sync action skips repo without synchronization parameters. """
-        sync_parent = make_temp_dir()
-        sync_output = os.path.join(sync_parent, 'output')
-        self.config.set('arch', ['x86_64'])
-
-        self.config.options['sync_output'] = sync_output
-        self.config.options['repos'] = {
+        sync_output = self._make_sync_output()
+        repos = {
             'repo1': {
                 'sync': {
                     'source': 'https://server1/repo1',
@@ -2074,11 +1936,11 @@ class ControllerProjectActionSyncTest(RiftProjectTestCase):
                 'url': 'https://server2/repo2',
             },
         }
-        # Update project YAML configuration with new options defined above
-        self.update_project_conf()
         # Run sync and check debug log is emited to indicate repo2 is skipped.
         with self.assertLogs(level='DEBUG') as log:
-            main(['sync'])
+            self._run_sync(
+                repos, archs=['x86_64'], sync_output=sync_output
+            )
             self.assertIn(
                 'WARNING:root:x86_64: Skipping repository repo2: no '
                 'synchronization parameters found',
@@ -2091,8 +1953,6 @@ class ControllerProjectActionSyncTest(RiftProjectTestCase):
             'https://server1/repo1/x86_64 **',
             mock_stdout.getvalue()
         )
-        # Clean synchronization output parent
-        shutil.rmtree(sync_parent)
 
     @patch('rift.Controller.RepoSyncFactory')
     def test_action_sync(self, mock_reposync):
@@ -2110,12 +1970,10 @@ class ControllerProjectActionSyncTest(RiftProjectTestCase):
         # Check factory is not called
         self.assertEqual(mock_reposync.get.call_count, 0)
 
-        # Create temporary synchronization output parent directory
-        sync_parent = make_temp_dir()
-        sync_output = os.path.join(sync_parent, 'output')
+        # Create temporary synchronization output directory
+        sync_output = self._make_sync_output()
 
-        # Add repositories with synchronization parameters in conf.
-        self.config.options['repos'] = {
+        repos = {
             'repo1': {
                 'sync': {
                     'source': 'https://server1/repo1',
@@ -2129,11 +1987,10 @@ class ControllerProjectActionSyncTest(RiftProjectTestCase):
                 'url': 'https://server2/repo2',
             },
         }
-        # Update project YAML configuration with new options defined above
-        self.update_project_conf()
 
-        # Run with --output parameter (without sync_output in conf)
-        main(['sync', '--output', sync_output])
+        # Add repositories with synchronization parameters in conf and run
+        # with --output parameter (without sync_output in conf)
+        self._run_sync(repos, cmd=['sync', '--output', sync_output])
 
         # Check factory has been called twice, for repo1 and repo2
         self.assertEqual(mock_reposync.get.call_count, 2)
@@ -2145,29 +2002,20 @@ class ControllerProjectActionSyncTest(RiftProjectTestCase):
         # Reset mock to check the second run.
         mock_reposync.get.reset_mock()
 
-        # Add sync_output parameter in conf.
-        self.config.options['sync_output'] = sync_output
-        self.update_project_conf()
-
-        # Run sync without -o, --output parameter.
-        main(['sync'])
+        # Add sync_output parameter in conf and run sync without -o, --output
+        # parameter.
+        self._run_sync(repos, sync_output=sync_output)
         # Check factory has been called twice, for repo1 and repo2
         self.assertEqual(mock_reposync.get.call_count, 2)
         # Check output directory has been created
         self.assertTrue(os.path.isdir(sync_output))
-        # Clean synchronization output parent
-        shutil.rmtree(sync_parent)
 
     @patch('rift.sync.RepoSyncBase.run')
     @patch('sys.stdout', new_callable=StringIO)
     def test_action_sync_multiarch(self, mock_stdout, mock_reposyncbase_run):
         """ Test rift runs sync action with multiple architectures. """
-        sync_parent = make_temp_dir()
-        sync_output = os.path.join(sync_parent, 'output')
-        self.config.set('arch', ['x86_64', 'aarch64'])
-
-        self.config.options['sync_output'] = sync_output
-        self.config.options['repos'] = {
+        sync_output = self._make_sync_output()
+        repos = {
             'repo1': {
                 'sync': {
                     'source': 'https://server1/repo1',
@@ -2188,13 +2036,13 @@ class ControllerProjectActionSyncTest(RiftProjectTestCase):
                 'url': 'https://server3/repo3',
             },
         }
-        # Update project YAML configuration with new options defined above
-        self.update_project_conf()
         # Run sync and check debug log is emited to indicate repo3 is skipped
         # with the 2nd architecture (as the URL is the same as for the 1st
         # arch).
         with self.assertLogs(level='DEBUG') as log:
-            main(['sync'])
+            self._run_sync(
+                repos, archs=['x86_64', 'aarch64'], sync_output=sync_output
+            )
             self.assertIn(
                 'DEBUG:root:Skipping already synchronized source '
                 'https://server3/repo3/',
@@ -2230,14 +2078,10 @@ class ControllerProjectActionSyncTest(RiftProjectTestCase):
             'https://server3/repo3/ **',
             mock_stdout.getvalue()
         )
-        # Clean synchronization output parent
-        shutil.rmtree(sync_parent)
 
     def test_action_sync_missing_output_parent(self):
         """ Test rift raises RiftError when sync output parent is not found. """
-        sync_output = "/tmp/rift/output"
-        self.config.options['sync_output'] = sync_output
-        self.config.options['repos'] = {
+        repos = {
             'repo1': {
                 'sync': {
                     'source': 'https://server1/repo1',
@@ -2251,14 +2095,12 @@ class ControllerProjectActionSyncTest(RiftProjectTestCase):
                 'url': 'https://server2/repo2',
             },
         }
-        # Update project YAML configuration with new options defined above
-        self.update_project_conf()
         with self.assertRaisesRegex(
             RiftError,
             "Unable to create repositories synchronization directory "
             "/tmp/rift/output, parent directory /tmp/rift does not exist."
         ):
-            main(['sync'])
+            self._run_sync(repos, sync_output="/tmp/rift/output")
 
 
 class ControllerProjectActionGraphTest(RiftProjectTestCase):
@@ -2269,38 +2111,40 @@ class ControllerProjectActionGraphTest(RiftProjectTestCase):
     @patch('rift.package.rpm.Mock')
     def test_get_packages_in_graph(self, mock_mock):
         """ Test get_packages_in_graph(). """
-        self.make_pkg(
+        make_pkg = self.make_pkg
+        make_pkg(
             name='libone',
             metadata={'module': 'Great module'},
         )
-        self.make_pkg(
+        make_pkg(
             name='libtwo',
             metadata={'module': 'Great module'},
         )
-        self.make_pkg(
+        make_pkg(
             name='my-software',
             metadata={'module': 'Other module'},
         )
+        config, staff, modules = self.config, self.staff, self.modules
         args = Mock()
         args.module = 'Great module'
         args.formats = None
         args.packages = []
         # mock Mock.read_spec to return spec file content directly read on host
         mock_mock.return_value.read_spec = read_file
-        self.assertCountEqual(
-            get_packages_in_graph(args, self.config, self.staff, self.modules),
+        self.assertEqual(
+            sorted(get_packages_in_graph(args, config, staff, modules)),
             ['libone', 'libtwo']
         )
         # Check adding format does not change result in this case.
         args.formats = ['rpm']
-        self.assertCountEqual(
-            get_packages_in_graph(args, self.config, self.staff, self.modules),
+        self.assertEqual(
+            sorted(get_packages_in_graph(args, config, staff, modules)),
             ['libone', 'libtwo']
         )
         args.module = None
         args.packages = ['libone', 'my-software']
-        self.assertCountEqual(
-            get_packages_in_graph(args, self.config, self.staff, self.modules),
+        self.assertEqual(
+            get_packages_in_graph(args, config, staff, modules),
             ['libone', 'my-software']
         )
         # When module arg is not set and packages args is empty,
@@ -2309,17 +2153,33 @@ class ControllerProjectActionGraphTest(RiftProjectTestCase):
         # PackagesDependencyGraph.draw().
         args.module = None
         args.packages = []
-        self.assertCountEqual(
-            get_packages_in_graph(args, self.config, self.staff, self.modules),
+        self.assertEqual(
+            get_packages_in_graph(args, config, staff, modules),
             []
         )
         args.module = 'fail'
         args.packages = []
         with self.assertRaisesRegex(RiftError, r"^Invalid module name fail$"):
-            get_packages_in_graph(args, self.config, self.staff, self.modules)
+            get_packages_in_graph(args, config, staff, modules)
 
 
-class ControllerProjectActionGitlabTest(RiftProjectTestCase):
+class ControllerProjectPatchTestCase(RiftProjectTestCase):
+    """
+    Base class for Controller actions on patch tests, with pkg spec file
+    patch written once for all tests of the class.
+    """
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.patch_file = make_temp_file(PKG_SPEC_PATCH)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.patch_file.close()
+        super().tearDownClass()
+
+
+class ControllerProjectActionGitlabTest(ControllerProjectPatchTestCase):
     """
     Tests class for Controller action gitlab
     """
@@ -2327,33 +2187,19 @@ class ControllerProjectActionGitlabTest(RiftProjectTestCase):
     def test_gitlab_missing_patch(self):
         """gerrit without patch"""
         cmd = ['gitlab']
-        with self.assertRaisesRegex(SystemExit, "2"):
+        with self.assertRaises(SystemExit) as cm:
             main(cmd)
+        self.assertEqual(cm.exception.code, 2)
 
     @patch('rift.package.rpm.Mock')
     def test_gitlab(self, mock_mock):
         """simple gitlab"""
         self.make_pkg()
-        patch_file = make_temp_file(
-            textwrap.dedent("""
-                diff --git a/packages/pkg/pkg.spec b/packages/pkg/pkg.spec
-                index d1a0d0e7..b3e36379 100644
-                --- a/packages/pkg/pkg.spec
-                +++ b/packages/pkg/pkg.spec
-                @@ -1,6 +1,6 @@
-                 Name:    pkg
-                 Version:        1.0
-                -Release:        1
-                +Release:        2
-                 Summary:        A package
-                 Group:          System Environment/Base
-                 License:        GPL
-                """))
         # mock Mock.read_spec to return spec file content directly read on host
         mock_mock.return_value.read_spec = read_file
         # Test no error is raised
         with patch.object(mock_mock.return_value, 'rpmlint', host_rpmlint):
-            main(['gitlab', patch_file.name])
+            main(['gitlab', self.patch_file.name])
 
     @patch('rift.package.rpm.Mock')
     def test_gitlab_check_failed(self, mock_mock):
@@ -2372,30 +2218,15 @@ class ControllerProjectActionGitlabTest(RiftProjectTestCase):
                     buildsteps="$RPM_SOURCE_DIR\n$RPM_BUILD_ROOT",
                 )
             )
-        patch_file = make_temp_file(
-            textwrap.dedent("""
-                diff --git a/packages/pkg/pkg.spec b/packages/pkg/pkg.spec
-                index d1a0d0e7..b3e36379 100644
-                --- a/packages/pkg/pkg.spec
-                +++ b/packages/pkg/pkg.spec
-                @@ -1,6 +1,6 @@
-                 Name:    pkg
-                 Version:        1.0
-                -Release:        1
-                +Release:        2
-                 Summary:        A package
-                 Group:          System Environment/Base
-                 License:        GPL
-                """))
         # mock Mock.read_spec to return spec file content directly read on host
         mock_mock.return_value.read_spec = read_file
         # Test error is raised
         with patch.object(mock_mock.return_value, 'rpmlint', host_rpmlint):
             with self.assertRaisesRegex(RiftError, "rpmlint reported errors"):
-                main(['gitlab', patch_file.name])
+                main(['gitlab', self.patch_file.name])
 
 
-class ControllerProjectActionGerritTest(RiftProjectTestCase):
+class ControllerProjectActionGerritTest(ControllerProjectPatchTestCase):
     """
     Tests class for Controller action gerrit
     """
@@ -2405,25 +2236,11 @@ class ControllerProjectActionGerritTest(RiftProjectTestCase):
     def test_gerrit(self, mock_review, mock_mock):
         """simple gerrit"""
         self.make_pkg()
-        patch_file = make_temp_file(
-            textwrap.dedent("""
-                diff --git a/packages/pkg/pkg.spec b/packages/pkg/pkg.spec
-                index d1a0d0e7..b3e36379 100644
-                --- a/packages/pkg/pkg.spec
-                +++ b/packages/pkg/pkg.spec
-                @@ -1,6 +1,6 @@
-                 Name:    pkg
-                 Version:        1.0
-                -Release:        1
-                +Release:        2
-                 Summary:        A package
-                 Group:          System Environment/Base
-                 License:        GPL
-                """))
         # mock Mock.read_spec to return spec file content directly read on host
         mock_mock.return_value.read_spec = read_file
         with patch.object(mock_mock.return_value, 'rpmlint', host_rpmlint):
-            main(['gerrit', '--change', '1', '--patchset', '2', patch_file.name])
+            main(['gerrit', '--change', '1', '--patchset', '2',
+                  self.patch_file.name])
         # Check review has not been invalidated and pushed
         mock_review.return_value.invalidate.assert_not_called()
         mock_review.return_value.push.assert_called_once()
@@ -2433,26 +2250,11 @@ class ControllerProjectActionGerritTest(RiftProjectTestCase):
     def test_gerrit_formats(self, mock_review, mock_mock):
         """gerrit with formats restriction"""
         self.make_pkg()
-        patch_file = make_temp_file(
-            textwrap.dedent("""
-                diff --git a/packages/pkg/pkg.spec b/packages/pkg/pkg.spec
-                index d1a0d0e7..b3e36379 100644
-                --- a/packages/pkg/pkg.spec
-                +++ b/packages/pkg/pkg.spec
-                @@ -1,6 +1,6 @@
-                 Name:    pkg
-                 Version:        1.0
-                -Release:        1
-                +Release:        2
-                 Summary:        A package
-                 Group:          System Environment/Base
-                 License:        GPL
-                """))
         # mock Mock.read_spec to return spec file content directly read on host
         mock_mock.return_value.read_spec = read_file
         with patch.object(mock_mock.return_value, 'rpmlint', host_rpmlint):
-            main(['gerrit', '--change', '1', '--patchset', '2', patch_file.name,
-                '--formats', 'rpm'])
+            main(['gerrit', '--change', '1', '--patchset', '2',
+                  self.patch_file.name, '--formats', 'rpm'])
         # Check review has not been invalidated and pushed
         mock_review.return_value.invalidate.assert_not_called()
         mock_review.return_value.push.assert_called_once()
@@ -2475,25 +2277,11 @@ class ControllerProjectActionGerritTest(RiftProjectTestCase):
                     buildsteps="$RPM_SOURCE_DIR\n$RPM_BUILD_ROOT",
                 )
             )
-        patch_file = make_temp_file(
-            textwrap.dedent("""
-                diff --git a/packages/pkg/pkg.spec b/packages/pkg/pkg.spec
-                index d1a0d0e7..b3e36379 100644
-                --- a/packages/pkg/pkg.spec
-                +++ b/packages/pkg/pkg.spec
-                @@ -1,6 +1,6 @@
-                 Name:    pkg
-                 Version:        1.0
-                -Release:        1
-                +Release:        2
-                 Summary:        A package
-                 Group:          System Environment/Base
-                 License:        GPL
-                """))
         # mock Mock.read_spec to return spec file content directly read on host
         mock_mock.return_value.read_spec = read_file
         with patch.object(mock_mock.return_value, 'rpmlint', host_rpmlint):
-            main(['gerrit', '--change', '1', '--patchset', '2', patch_file.name])
+            main(['gerrit', '--change', '1', '--patchset', '2',
+                  self.patch_file.name])
         # Check review has been invalidated and pushed
         mock_review.return_value.invalidate.assert_called_once()
         mock_review.return_value.push.assert_called_once()
@@ -2504,17 +2292,23 @@ class ControllerProjectActionChangelogTest(RiftProjectTestCase):
     Tests class for Controller action changelog
     """
 
-    def test_action_changelog_without_maintainer(self):
-        """changelog without maintainer """
-        with self.assertRaisesRegex(RiftError, "You must specify a maintainer"):
-            main(['changelog', 'pkg', '-c', 'basic change'])
-
-    def test_action_changelog_pkg_not_found(self):
-        """changelog package not found"""
-        with self.assertRaisesRegex(
-            RiftError,
-            "Package 'pkg' directory does not exist"):
-            main(['changelog', 'pkg', '-c', 'basic change', '-t', 'Myself'])
+    def test_action_changelog_argument_errors(self):
+        """changelog without package, comment, maintainer or package not found"""
+        # Missing arguments are rejected by the parser
+        for cmd in (['changelog'], ['changelog', 'pkg']):
+            with self.subTest(cmd=cmd):
+                with self.assertRaises(SystemExit) as cm:
+                    main(cmd)
+                self.assertEqual(cm.exception.code, 2)
+        for cmd, exc_regex in (
+            (['changelog', 'pkg', '-c', 'basic change'],
+             RE_MISSING_MAINTAINER),
+            (['changelog', 'pkg', '-c', 'basic change', '-t', 'Myself'],
+             "Package 'pkg' directory does not exist"),
+        ):
+            with self.subTest(cmd=cmd):
+                with self.assertRaisesRegex(RiftError, exc_regex):
+                    main(cmd)
 
     @patch('rift.package.rpm.Mock')
     def test_action_changelog(self, mock_mock):
@@ -2576,16 +2370,21 @@ class ControllerProjectActionChangelogTest(RiftProjectTestCase):
 class ControllerArgumentsTest(RiftTestCase):
     """ Arguments parsing tests for Controller module"""
 
+    @classmethod
+    def setUpClass(cls):
+        # Parser is not modified by parse_args(), build it once for all tests
+        cls.parser = make_parser()
+
     def test_make_parser_updaterepo(self):
         """ Test option parsing """
         args = ["build", "a_package", "--dont-update-repo"]
-        parser = make_parser()
+        parser = self.parser
         opts = parser.parse_args(args)
         self.assertFalse(opts.updaterepo)
 
     def test_parse_args_build(self):
         """ Test build command options parsing """
-        parser = make_parser()
+        parser = self.parser
 
         args = ['build']
         opts = parser.parse_args(args)
@@ -2607,7 +2406,7 @@ class ControllerArgumentsTest(RiftTestCase):
 
     def test_parse_args_test(self):
         """ Test test command options parsing """
-        parser = make_parser()
+        parser = self.parser
 
         args = ['test']
         opts = parser.parse_args(args)
@@ -2623,7 +2422,7 @@ class ControllerArgumentsTest(RiftTestCase):
 
     def test_parse_args_validate(self):
         """ Test validate command options parsing """
-        parser = make_parser()
+        parser = self.parser
 
         args = ['validate']
         opts = parser.parse_args(args)
@@ -2645,7 +2444,7 @@ class ControllerArgumentsTest(RiftTestCase):
 
     def test_parse_args_validdiff(self):
         """ Test validdiff command options parsing """
-        parser = make_parser()
+        parser = self.parser
 
         opts = parser.parse_args(['validdiff', '/dev/null'])
         self.assertFalse(opts.quiet)
@@ -2666,7 +2465,7 @@ class ControllerArgumentsTest(RiftTestCase):
 
     def test_parse_args_query(self):
         """ Test query command options parsing """
-        parser = make_parser()
+        parser = self.parser
 
         args = ['query']
         opts = parser.parse_args(args)
@@ -2682,7 +2481,7 @@ class ControllerArgumentsTest(RiftTestCase):
 
     def test_parse_args_changelog(self):
         """ Test changelog command options parsing """
-        parser = make_parser()
+        parser = self.parser
 
         args = ['changelog']
         with self.assertRaises(SystemExit):
@@ -2706,13 +2505,14 @@ class ControllerArgumentsTest(RiftTestCase):
 
     def test_parse_args_gerrit(self):
         """ Test gerrit command options parsing """
-        parser = make_parser()
+        parser = self.parser
 
         for args in (['gerrit', '--change', '1', '--patchset', '2'],
                     ['gerrit', '--patchset', '2', '/dev/null'],
                     ['gerrit', '--change', '1', '/dev/null']):
-            with self.assertRaisesRegex(SystemExit, "2"):
+            with self.assertRaises(SystemExit) as cm:
                 opts = parser.parse_args(args)
+            self.assertEqual(cm.exception.code, 2)
 
         args = ['gerrit', '--change', '1', '--patchset', '2', '/dev/null']
         opts = parser.parse_args(args)
@@ -2730,7 +2530,7 @@ class ControllerArgumentsTest(RiftTestCase):
 
     def test_parse_args_graph(self):
         """ Test graph command options parsing """
-        parser = make_parser()
+        parser = self.parser
 
         args = ['graph']
         opts = parser.parse_args(args)
@@ -2753,7 +2553,7 @@ class ControllerArgumentsTest(RiftTestCase):
 
     def test_make_parser_vm(self):
         """ Test vm command options parsing """
-        parser = make_parser()
+        parser = self.parser
 
         args = ['vm', '--arch', 'x86_64']
         opts = parser.parse_args(args)
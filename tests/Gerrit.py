@@ -9,17 +9,29 @@ from rift.Gerrit import Review
 from rift import RiftError
 
 class GerritTest(RiftTestCase):
+    GERRIT_CONFIG = {
+        'realm': 'Rift',
+        'server': 'localhost',
+        'username': 'rift',
+        'password': 'SECR3T',
+    }
+
+    @classmethod
+    def setUpClass(cls):
+        # Never send HTTP requests in tests
+        cls.urlopen_patcher = mock.patch(
+            "rift.Gerrit.urllib.urlopen", autospec=True
+        )
+        cls.mock_urlopen = cls.urlopen_patcher.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.urlopen_patcher.stop()
+
     def setUp(self):
+        self.mock_urlopen.reset_mock()
         self.config = Config()
-        self.config.set(
-            'gerrit',
-            {
-                'realm': 'Rift',
-                'server': 'localhost',
-                'username': 'rift',
-                'password': 'SECR3T',
-            }
-        )
+        self.config.set('gerrit', dict(self.GERRIT_CONFIG))
         self.review = Review()
         self.review.add_comment('/path/to/file', 42, 'E', 'test error message')
 
@@ -29,14 +41,13 @@ class GerritTest(RiftTestCase):
         self.review.invalidate()
         self.assertEqual(self.review.validated, False)
 
-    @mock.patch("rift.Gerrit.urllib.urlopen")
-    def test_push(self, mock_urlopen):
+    def test_push(self):
         """ Test Review push """
         self.review.push(self.config, 4242, 42)
         # Check push successfully send HTTP request with urllib.urlopen() and
         # reads its result.
-        mock_urlopen.assert_called_once()
-        mock_urlopen.return_value.read.assert_called_once()
+        self.mock_urlopen.assert_called_once()
+        self.mock_urlopen.return_value.read.assert_called_once()
 
     def test_push_no_config(self):
         """ Test Review push w/o gerrit config error """
@@ -47,10 +58,13 @@ class GerritTest(RiftTestCase):
     def test_push_missing_conf_param(self):
         """ Test Review push with missing parameter error """
         gerrit_conf = self.config.get('gerrit')
-        for parameter, value in gerrit_conf.copy().items():
-            # temporary remove parameter
-            del gerrit_conf[parameter]
-            with self.assertRaisesRegex(RiftError, "Gerrit .* is not defined"):
-                self.review.push(self.config, 4242, 42)
-            # restore value
-            gerrit_conf[parameter] = value
+        for parameter in gerrit_conf:
+            with self.subTest(parameter=parameter):
+                self.config.options['gerrit'] = {
+                    key: value for key, value in gerrit_conf.items()
+                    if key != parameter
+                }
+                with self.assertRaisesRegex(
+                    RiftError, "Gerrit .* is not defined"
+                ):
+                    self.review.push(self.config, 4242, 42)
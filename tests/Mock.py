@@ -8,7 +8,7 @@ import tempfile
 from textwrap import dedent
 from unittest.mock import patch, MagicMock, ANY
 
-from .TestUtils import RiftProjectTestCase
+from .TestUtils import RiftProjectTestCase, read_file
 from rift.Mock import Mock, rpmlint_chroot_script, rpmlint_env
 from rift.repository import ProjectArchRepositories
 from rift.repository.rpm import ConsumableRepository
@@ -19,6 +19,8 @@ from rift.Config import _DEFAULT_VARIANT
 from rift import RiftError
 
 TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+USER = getpass.getuser()
+X86_64_MOCKNAME = f"rift-x86_64-{USER}-1.0"
 
 
 class MockTest(RiftProjectTestCase):
@@ -26,10 +28,27 @@ class MockTest(RiftProjectTestCase):
     Tests class for Mock
     """
 
+    def setUp(self):
+        super().setUp()
+        # Never run mock command in tests, emulate successful execution by
+        # default.
+        patcher = patch('rift.Mock.run_command')
+        self.mock_run_command = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_run_command.return_value = RunResult(0, None, None)
+
+    @staticmethod
+    def _mock_with_tmpdir(config):
+        """Return x86_64 Mock object with initialized tmp directory."""
+        mock = Mock(config=config, arch='x86_64', proj_vers=1.0)
+        mock._tmpdir = TempDir('test_mock')
+        mock._tmpdir.create()
+        return mock
+
     def test_mock_object(self):
         """ Test Mock instanciation """
         mock = Mock(config=[], arch='x86_64', proj_vers=1.0)
-        self.assertEqual(mock._mockname, "rift-x86_64-{}-1.0".format(getpass.getuser()))
+        self.assertEqual(mock._mockname, X86_64_MOCKNAME)
         self.assertEqual(mock._config, [])
 
     def test_build_context(self):
@@ -47,7 +66,7 @@ class MockTest(RiftProjectTestCase):
             )
         ]
         context = mock._build_template_ctx(repolist)
-        self.assertEqual(context['name'], 'rift-{}-{}'.format(arch, getpass.getuser()))
+        self.assertEqual(context['name'], 'rift-{}-{}'.format(arch, USER))
         self.assertEqual(context['arch'], arch)
         repos_ctx = context['repos'][0]
         self.assertEqual(repos_ctx['name'], 'tmp')
@@ -57,27 +76,19 @@ class MockTest(RiftProjectTestCase):
         self.assertEqual(repos_ctx['excludepkgs'], 'somepkg')
         self.assertEqual(repos_ctx['proxy'], 'myproxy')
 
-    @patch('rift.Mock.run_command')
-    def test_init(self, mock_run_command):
+    def test_init(self):
         """ Test Mock init creates all files required by mock """
-        # Emulate successful mock execution
-        mock_run_command.return_value = RunResult(0, None, None)
         mock = Mock(config=self.config, arch='x86_64', proj_vers=1.0)
         mock.init([])
-        self.assertTrue(
-            os.path.exists(os.path.join(mock._tmpdir.path, mock.MOCK_DEFAULT))
-        )
-        for filename in mock.MOCK_FILES:
-            self.assertTrue(
-                os.path.exists(os.path.join(mock._tmpdir.path, filename))
-            )
+        tmpdir = mock._tmpdir.path
+        for filename in [mock.MOCK_DEFAULT] + mock.MOCK_FILES:
+            self.assertTrue(os.path.exists(os.path.join(tmpdir, filename)))
         mock.clean()
 
-    @patch('rift.Mock.run_command')
-    def test_init_mock_failure(self, mock_run_command):
+    def test_init_mock_failure(self):
         """ Test Mock init raise error on mock command failure """
         # Emulate mock execution failure
-        mock_run_command.return_value = RunResult(1, "output", None)
+        self.mock_run_command.return_value = RunResult(1, "output", None)
         mock = Mock(config=self.config, arch='x86_64', proj_vers=1.0)
         with self.assertRaisesRegex(RiftError, "^output$"):
             mock.init([])
@@ -97,10 +108,7 @@ class MockTest(RiftProjectTestCase):
 
     def test_args(self):
         """ Test mock standard arguments """
-        mock = Mock(config={}, arch='x86_64', proj_vers=1.0)
-        # Init tmp directory
-        mock._tmpdir = TempDir('test_mock')
-        mock._tmpdir.create()
+        mock = self._mock_with_tmpdir({})
         self.assertEqual(mock._mock_base(),
                          ['mock',
                           '--config-opts',
@@ -109,10 +117,7 @@ class MockTest(RiftProjectTestCase):
 
     def test_args_with_macros(self):
         """ Test Mock macro arguments """
-        mock = Mock(config={"rpm_macros": {"my_version" : 1}}, arch='x86_64', proj_vers=1.0)
-        # Init tmp directory
-        mock._tmpdir = TempDir('test_mock')
-        mock._tmpdir.create()
+        mock = self._mock_with_tmpdir({"rpm_macros": {"my_version" : 1}})
 
         macro_file = os.path.join(mock._tmpdir.path, 'rpm.macro')
         self.assertEqual(mock._mock_base(),
@@ -121,17 +126,11 @@ class MockTest(RiftProjectTestCase):
                           'print_main_output=yes',
                           f'--configdir={mock._tmpdir.path}',
                           f'--macro-file={macro_file}'])
-        self.assertEqual(open(macro_file).readlines(), ["%my_version 1\n"])
+        self.assertEqual(read_file(macro_file), "%my_version 1\n")
 
-    @patch('rift.Mock.run_command')
-    def test_build_rpms(self, mock_run_command):
+    def test_build_rpms(self):
         """ Test Mock build_rpms() mock build command line """
-        # Emulate successful mock execution
-        mock_run_command.return_value = RunResult(0, None, None)
-        mock = Mock(config=self.config, arch='x86_64', proj_vers=1.0)
-        # Init tmp directory
-        mock._tmpdir = TempDir('test_mock')
-        mock._tmpdir.create()
+        mock = self._mock_with_tmpdir(self.config)
 
         src_rpm_path = os.path.join(
             TESTS_DIR, 'materials', 'pkg-1.0-1.src.rpm'
@@ -139,7 +138,7 @@ class MockTest(RiftProjectTestCase):
         repos = ProjectArchRepositories(self.config, 'x86_64').for_format('rpm')
         srpm = RPM(src_rpm_path)
         mock.build_rpms(srpm, _DEFAULT_VARIANT, repos, False)
-        mock_run_command.assert_called_once_with(
+        self.mock_run_command.assert_called_once_with(
             [
                 'mock',
                 '--config-opts',
@@ -155,15 +154,9 @@ class MockTest(RiftProjectTestCase):
             cwd='/'
         )
 
-    @patch('rift.Mock.run_command')
-    def test_build_rpms_variant(self, mock_run_command):
+    def test_build_rpms_variant(self):
         """ Test Mock build_rpms() mock build command line with variant """
-        # Emulate successful mock execution
-        mock_run_command.return_value = RunResult(0, None, None)
-        mock = Mock(config=self.config, arch='x86_64', proj_vers=1.0)
-        # Init tmp directory
-        mock._tmpdir = TempDir('test_mock')
-        mock._tmpdir.create()
+        mock = self._mock_with_tmpdir(self.config)
         src_rpm_path = os.path.join(
             TESTS_DIR, 'materials', 'pkg-1.0-1.src.rpm'
         )
@@ -176,7 +169,7 @@ class MockTest(RiftProjectTestCase):
         )
         srpm = RPM(src_rpm_path)
         mock.build_rpms(srpm, 'variant1', repos, False)
-        mock_run_command.assert_called_once_with(
+        self.mock_run_command.assert_called_once_with(
             [
                 'mock',
                 '--config-opts',
@@ -198,15 +191,14 @@ class MockTest(RiftProjectTestCase):
             cwd='/'
         )
 
-    @patch('rift.Mock.run_command')
-    def test_read_spec(self, mock_run_command):
-        mock_run_command.return_value = RunResult(
+    def test_read_spec(self):
+        self.mock_run_command.return_value = RunResult(
             0, "standard output", "standard error"
         )
         mock = Mock(config=self.config, arch='x86_64', proj_vers=1.0)
         mock.init([])
         result = mock.read_spec('/dev/package.spec')
-        mock_run_command.assert_called_with(
+        self.mock_run_command.assert_called_with(
             [
                 'mock', '--config-opts', 'print_main_output=yes',
                 f"--configdir={mock._tmpdir.path}",
@@ -225,26 +217,24 @@ class MockTest(RiftProjectTestCase):
         mock.clean()
         self.assertEqual(result, "standard output")
 
-    @patch('rift.Mock.run_command')
-    def test_read_spec_exec_error(self, mock_run_command):
+    def test_read_spec_exec_error(self):
         mock = Mock(config=self.config, arch='x86_64', proj_vers=1.0)
         # First run_command call for init OK
-        mock_run_command.return_value = RunResult(
+        self.mock_run_command.return_value = RunResult(
             0, "standard output", "standard error"
         )
         mock.init([])
         # Second run_command call for rpmspec with non-zero return code
-        mock_run_command.return_value = RunResult(
+        self.mock_run_command.return_value = RunResult(
             1, "standard output", "standard error"
         )
         with self.assertRaisesRegex(RiftError, "standard error"):
             mock.read_spec('/dev/package.spec')
         mock.clean()
 
-    @patch('rift.Mock.run_command')
-    def test_read_spec_filter_output(self, mock_run_command):
+    def test_read_spec_filter_output(self):
         output = "error: foo\nwarning: bar\nstandard output\nsh: baz\nrpm: qux\n"
-        mock_run_command.return_value = RunResult(0, output, "standard error")
+        self.mock_run_command.return_value = RunResult(0, output, "standard error")
         mock = Mock(config=self.config, arch='x86_64', proj_vers=1.0)
         mock.init([])
         result = mock.read_spec('/dev/package.spec')
@@ -313,15 +303,14 @@ class MockTest(RiftProjectTestCase):
             script,
         )
 
-    @patch('rift.Mock.run_command')
-    def test_rpmlint(self, mock_run_command):
+    def test_rpmlint(self):
         """Test Mock.rpmlint() installs rpmlint, runs it in chroot, cleans, returns result."""
         spec_path = '/dev/package.spec'
         expected_script = rpmlint_chroot_script(spec_path)
 
         mock = Mock(config=self.config, arch='x86_64', proj_vers=1.0)
 
-        mock_run_command.side_effect = [
+        self.mock_run_command.side_effect = [
             RunResult(0, None, None),  # init
             RunResult(0, None, None),  # install rpmlint
             RunResult(4, 'rpmlint stdout', 'rpmlint stderr'),  # chroot rpmlint
@@ -332,14 +321,14 @@ class MockTest(RiftProjectTestCase):
 
         # Check return value
         self.assertEqual(result, RunResult(4, 'rpmlint stdout', 'rpmlint stderr'))
-        self.assertEqual(mock_run_command.call_count, 4)
+        self.assertEqual(self.mock_run_command.call_count, 4)
 
         # Check mock command calls
         base = [
             'mock', '--config-opts', 'print_main_output=yes',
             f'--configdir={mock._tmpdir.path}',
         ]
-        mock_run_command.assert_any_call(
+        self.mock_run_command.assert_any_call(
             base + [
                 '--no-clean', '--no-cleanup-after', '--quiet',
                 '--pm-cmd', 'install', '-y', 'rpmlint', 'kernel-devel',
@@ -349,7 +338,7 @@ class MockTest(RiftProjectTestCase):
             merge_out_err=True,
             cwd='/',
         )
-        mock_run_command.assert_any_call(
+        self.mock_run_command.assert_any_call(
             base + [
                 "--plugin-option=bind_mount:dirs=[('/dev', '/dev')]",
                 '--quiet', 'chroot', '--', 'bash', '-c', expected_script,
@@ -359,7 +348,7 @@ class MockTest(RiftProjectTestCase):
             cwd='/',
             env=None,
         )
-        mock_run_command.assert_any_call(
+        self.mock_run_command.assert_any_call(
             base + ['--quiet', '--clean'],
             live_output=ANY,
             capture_output=True,
@@ -368,11 +357,10 @@ class MockTest(RiftProjectTestCase):
         )
         mock.clean()
 
-    @patch('rift.Mock.run_command')
-    def test_rpmlint_install_failure_no_chroot_or_clean(self, mock_run_command):
+    def test_rpmlint_install_failure_no_chroot_or_clean(self):
         """Test Mock.rpmlint() install failure no chroot or clean."""
         mock = Mock(config=self.config, arch='x86_64', proj_vers=1.0)
-        mock_run_command.side_effect = [
+        self.mock_run_command.side_effect = [
             RunResult(0, None, None),  # init
             RunResult(1, 'install failed', None),  # install rpmlint/kernel-devel
         ]
@@ -381,4 +369,4 @@ class MockTest(RiftProjectTestCase):
             mock.rpmlint('/dev/package.spec')
         mock.clean()
         # Check mock called 2 commands: init and install rpmlint/kernel-devel.
-        self.assertEqual(mock_run_command.call_count, 2)
+        self.assertEqual(self.mock_run_command.call_count, 2)
@@ -2,17 +2,23 @@
 # Copyright (C) 2020 CEA
 #
 import os
+import pathlib as pl
+import re
 import time
 import rpm
 import shutil
 import subprocess
+import tempfile
+from functools import lru_cache
 from unittest.mock import MagicMock, patch
 
 from .TestUtils import (
-    make_temp_dir,
     gen_rpm_spec,
     read_file,
     host_rpmlint,
+    copy_gpg_keyring,
+    remove_gpg_keyrings,
+    GPG_KEY,
     RiftTestCase,
     RiftProjectTestCase,
 )
@@ -21,6 +27,20 @@ from rift.RPM import Spec, Variable, RPM
 from rift.Mock import Mock, RPMLINT_CONFIG_V1, RPMLINT_CONFIG_V2
 
 
+MATERIALS_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'materials'
+)
+
+# Keygrip field in gpg --with-colons --with-keygrip output
+GPG_KEYGRIP_RE = re.compile(r'^grp:+([0-9A-F]+):', re.MULTILINE)
+
+
+def tearDownModule():
+    # Remove GPG keyrings generated for signature tests
+    remove_gpg_keyrings()
+
+
+@lru_cache(maxsize=1)
 def rpmlint_v2():
     """Return True if host rpmlint major version is 2."""
     try:
@@ -41,45 +61,78 @@ class SpecTest(RiftTestCase):
     Tests class for Spec
     """
 
-    def setUp(self):
-        self.name='pkg'
-        self.version='1.0'
-        self.release='1'
-        self.arch='noarch'
+    name = 'pkg'
+    version = '1.0'
+    release = '1'
+    arch = 'noarch'
+
+    @classmethod
+    def setUpClass(cls):
+        # Spec file shared by all tests which do not modify it:
         # /tmp/rift-*/pkg.spec
-        self.directory = make_temp_dir()
-        self.spec = os.path.join(self.directory, "{0}.spec".format(self.name))
-        self.prepsteps = ""
-        self.buildsteps = ""
-        self.installsteps = ""
-        self.files = ""
-        self.exclusive_arch = None
-        self.variants = None
+        cls.tmp_directory = tempfile.TemporaryDirectory(prefix='rift-test-')
+        cls.directory = cls.tmp_directory.name
+        cls.spec = os.path.join(cls.directory, "{0}.spec".format(cls.name))
+        cls.write_spec(cls.spec)
+        # Spec object loaded once for tests which do not modify it
+        mock = MagicMock(autospec=Mock)
+        mock.read_spec.side_effect = read_file
+        cls.shared_spec = Spec(cls.spec, mock, None)
+        # Directory of spec files modified by tests, overwritten by each test
+        cls.tmp_work_directory = tempfile.TemporaryDirectory(prefix='rift-test-')
+        cls.work_directory = cls.tmp_work_directory.name
+        # Date of changelog entries added by tests
+        cls.today = time.strftime("%a %b %d %Y", time.gmtime())
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_directory.cleanup()
+        cls.tmp_work_directory.cleanup()
+
+    def setUp(self):
         self.mock = MagicMock(autospec=Mock)
         # mock Mock.read_spec to return spec file content directly read on host
         self.mock.read_spec.side_effect = read_file
-        self.update_spec()
-
-    def update_spec(self):
-        with open(self.spec, "w") as spec:
-            spec.write(
-                gen_rpm_spec(
-                    name=self.name,
-                    version=self.version,
-                    release=self.release,
-                    arch=self.arch,
-                    prepsteps=self.prepsteps,
-                    buildsteps=self.buildsteps,
-                    installsteps=self.installsteps,
-                    files=self.files,
-                    exclusive_arch=self.exclusive_arch,
-                    variants=self.variants,
-                )
-            )
 
-    def tearDown(self):
-        os.unlink(self.spec)
-        os.rmdir(self.directory)
+    @classmethod
+    def write_spec(cls, path, **kwargs):
+        """
+        Write in path spec file generated with class attributes, overriden by
+        gen_rpm_spec() kwargs.
+        """
+        params = {
+            'name': cls.name,
+            'version': cls.version,
+            'release': cls.release,
+            'arch': cls.arch,
+            'variants': None,
+        }
+        params.update(kwargs)
+        with open(path, "w") as spec:
+            spec.write(gen_rpm_spec(**params))
+
+    def own_spec(self):
+        """
+        Switch test to its own spec file in class work directory, to leave the
+        spec file shared by other tests unmodified. Return spec file path.
+        """
+        self.directory = self.work_directory
+        self.spec = os.path.join(
+            self.directory, os.path.basename(type(self).spec)
+        )
+        return self.spec
+
+    def copy_spec(self):
+        """Copy shared spec file in test own spec file."""
+        shutil.copyfile(type(self).spec, self.own_spec())
+
+    def update_spec(self, **kwargs):
+        """
+        Write test own spec file generated with gen_rpm_spec() kwargs and
+        return its path.
+        """
+        self.write_spec(self.own_spec(), **kwargs)
+        return self.spec
 
     def test_init(self):
         """ Test Spec instanciation """
@@ -98,8 +151,7 @@ class SpecTest(RiftTestCase):
 
     def test_init_variant(self):
         """ Test Spec instanciation """
-        self.variants = ['variant1', 'variant2']
-        self.update_spec()
+        self.update_spec(variants=['variant1', 'variant2'])
         spec = Spec(self.spec, self.mock, None, variant='variant1')
         self.assertIn(self.name, spec.pkgnames)
         self.assertEqual(len(spec.pkgnames), 2)
@@ -126,36 +178,34 @@ class SpecTest(RiftTestCase):
         # Make an errorneous specfile with hardcoded /lib
         if rpmlint_v2():
             self.skipTest("This test requires rpmlint v1")
-        self.files = "/lib/test"
-        self.update_spec()
+        self.update_spec(files="/lib/test")
+        spec = Spec(self.spec, self.mock, None)
         with patch.object(self.mock, 'rpmlint', host_rpmlint):
             with self.assertRaisesRegex(RiftError, 'rpmlint reported errors'):
-                Spec(self.spec, self.mock, None).check()
+                spec.check()
 
             # Create rpmlint config to ignore hardcoded library path
-            rpmlintfile = os.sep.join([self.directory, RPMLINT_CONFIG_V1])
-            with open(rpmlintfile, "w") as rpmlint:
-                rpmlint.write('addFilter("E: hardcoded-library-path")')
-            self.assertIsNone(Spec(self.spec, self.mock, None).check())
-        os.unlink(rpmlintfile)
+            rpmlintfile = os.path.join(self.directory, RPMLINT_CONFIG_V1)
+            pl.Path(rpmlintfile).write_text('addFilter("E: hardcoded-library-path")')
+            self.addCleanup(os.unlink, rpmlintfile)
+            self.assertIsNone(spec.check())
 
     def test_specfile_check_with_rpmlint_v2(self):
         """ Test specfile check function with a custom rpmlint v2 file"""
         if not rpmlint_v2():
             self.skipTest("This test requires rpmlint v2")
-        self.buildsteps = "$RPM_BUILD_ROOT"
-        self.update_spec()
+        self.update_spec(buildsteps="$RPM_BUILD_ROOT")
 
+        spec = Spec(self.spec, self.mock, None)
         with patch.object(self.mock, 'rpmlint', host_rpmlint):
             with self.assertRaisesRegex(RiftError, 'rpmlint reported errors'):
-                Spec(self.spec, self.mock, None).check()
+                spec.check()
 
             # Create rpmlint config file to ignore rpm-buildroot-usage
-            rpmlintfile = os.sep.join([self.directory, RPMLINT_CONFIG_V2])
-            with open(rpmlintfile, "w") as rpmlint:
-                rpmlint.write('Filters = ["rpm-buildroot-usage"]')
-            self.assertIsNone(Spec(self.spec, self.mock, None).check())
-        os.unlink(rpmlintfile)
+            rpmlintfile = os.path.join(self.directory, RPMLINT_CONFIG_V2)
+            pl.Path(rpmlintfile).write_text('Filters = ["rpm-buildroot-usage"]')
+            self.addCleanup(os.unlink, rpmlintfile)
+            self.assertIsNone(spec.check())
 
     def test_bump_release(self):
         """ Test bump_release """
@@ -180,72 +230,77 @@ class SpecTest(RiftTestCase):
 
     def test_add_changelog_entry(self):
         """ Test add_changelog_entry """
+        self.copy_spec()
         spec = Spec(self.spec, self.mock, None)
         comment = "- New feature"
         userstr = "John Doe"
-        date = time.strftime("%a %b %d %Y", time.gmtime())
 
         # Check adding changelog entry
         spec.add_changelog_entry(userstr, comment)
-        with open(spec.filepath, 'r') as fspec:
-            lines = fspec.readlines()
-        self.assertTrue("* {} {} - {}\n".format(date, userstr, spec.evr) in lines)
-        self.assertTrue("{}\n".format(comment) in lines)
+        content = read_file(spec.filepath)
+        self.assertIn(
+            "\n* {} {} - {}\n{}\n".format(
+                self.today, userstr, spec.evr, comment
+            ),
+            content,
+        )
 
     def test_add_changelog_entry_bump(self):
         """ Test add_changelog_entry with bump release"""
+        self.copy_spec()
         spec = Spec(self.spec, self.mock, None)
         comment = "- New feature (Bumped)"
         userstr = "John Doe"
-        date = time.strftime("%a %b %d %Y", time.gmtime())
 
         spec.add_changelog_entry(userstr, comment, bump=True)
-        with open(spec.filepath, 'r') as fspec:
-            lines = fspec.readlines()
-        self.assertTrue("Release:        {}\n".format(spec.release) in lines)
-        self.assertTrue("* {} {} - {}\n".format(date, userstr, spec.evr) in lines)
-        self.assertTrue("{}\n".format(comment) in lines)
+        content = read_file(spec.filepath)
+        self.assertIn("\nRelease:        {}\n".format(spec.release), content)
+        self.assertIn(
+            "\n* {} {} - {}\n{}\n".format(
+                self.today, userstr, spec.evr, comment
+            ),
+            content,
+        )
 
 
     def test_parse_vars(self):
         """ Test spec variables parsing """
-        spec = Spec(self.spec, self.mock, None)
-        self.assertTrue(str(spec.variables['foo']) == '1.%{bar}')
-        self.assertTrue(spec.variables['foo'].value == '1.%{bar}')
-        self.assertTrue(spec.variables['foo'].name == 'foo')
-        self.assertTrue(spec.variables['foo'].index == 0)
-        self.assertTrue(spec.variables['foo'].keyword == 'global')
-        self.assertTrue(str(spec.variables['bar']) == '1')
-        self.assertTrue(spec.variables['bar'].keyword == 'define')
-        self.assertTrue(spec.variables['bar'].index == 1)
+        spec = self.shared_spec
+        self.assertEqual(str(spec.variables['foo']), '1.%{bar}')
+        self.assertEqual(spec.variables['foo'].value, '1.%{bar}')
+        self.assertEqual(spec.variables['foo'].name, 'foo')
+        self.assertEqual(spec.variables['foo'].index, 0)
+        self.assertEqual(spec.variables['foo'].keyword, 'global')
+        self.assertEqual(str(spec.variables['bar']), '1')
+        self.assertEqual(spec.variables['bar'].keyword, 'define')
+        self.assertEqual(spec.variables['bar'].index, 1)
 
     def test_match_var(self):
         """ Tests variable detection in pattern """
-        spec = Spec(self.spec, self.mock, None)
+        spec = self.shared_spec
         foo = spec.variables['foo']
         bar = spec.variables['bar']
-        self.assertTrue(spec._match_var('%{foo}', r'^1') == foo)
-        self.assertTrue(spec._match_var('%{foo}') == bar)
-        self.assertTrue(spec._match_var('%{?foo}') == bar)
-        self.assertTrue(spec._match_var('%{foo}%{bar}') == bar)
-        self.assertTrue(spec._match_var('%{bar}') == bar)
-        self.assertTrue(spec._match_var('%{notthere}') is None)
-        self.assertTrue(spec._match_var('%{notthere}%{foo}') == bar)
-        self.assertTrue(spec._match_var('%{foo}%{?dist}') == bar)
-        self.assertTrue(spec._match_var('%{foo}%{bar}%{?dist}') == bar)
-        self.assertTrue(spec._match_var('no vars inside') is None)
+        self.assertEqual(spec._match_var('%{foo}', r'^1'), foo)
+        self.assertEqual(spec._match_var('%{foo}'), bar)
+        self.assertEqual(spec._match_var('%{?foo}'), bar)
+        self.assertEqual(spec._match_var('%{foo}%{bar}'), bar)
+        self.assertEqual(spec._match_var('%{bar}'), bar)
+        self.assertIsNone(spec._match_var('%{notthere}'))
+        self.assertEqual(spec._match_var('%{notthere}%{foo}'), bar)
+        self.assertEqual(spec._match_var('%{foo}%{?dist}'), bar)
+        self.assertEqual(spec._match_var('%{foo}%{bar}%{?dist}'), bar)
+        self.assertIsNone(spec._match_var('no vars inside'))
 
     def test_supports_arch_w_exclusive_arch(self):
         """ Test supports_arch() with ExclusiveArch"""
-        self.exclusive_arch = "x86_64"
-        self.update_spec()
+        self.update_spec(exclusive_arch="x86_64")
         spec = Spec(self.spec, self.mock, None)
         self.assertTrue(spec.supports_arch('x86_64'))
         self.assertFalse(spec.supports_arch('aarch64'))
 
     def test_supports_arch_wo_exclusive_arch(self):
         """ Test supports_arch() without ExclusiveArch"""
-        spec = Spec(self.spec, self.mock, None)
+        spec = self.shared_spec
         self.assertTrue(spec.supports_arch('x86_64'))
         self.assertTrue(spec.supports_arch('aarch64'))
 
@@ -254,28 +309,23 @@ class VariableTest(RiftTestCase):
     def test_str(self):
         """ Test string representation """
         var = Variable(index=3, name='foo', value='bar', keyword='define')
-        self.assertTrue(str(var) == 'bar' )
+        self.assertEqual(str(var), 'bar')
 
     def test_spec_output(self):
         """ Test variable format output """
         var = Variable(index=0, name='foo', value='bar', keyword='define')
-        self.assertTrue(var.spec_output() == '%define foo bar' )
+        self.assertEqual(var.spec_output(), '%define foo bar')
         buff = ['']
         var.spec_output(buff)
-        self.assertTrue(buff[0] == '%define foo bar\n')
+        self.assertEqual(buff[0], '%define foo bar\n')
 
 
 class RPMTest(RiftProjectTestCase):
     """ Test RPM class """
     def setUp(self):
         super().setUp()
-        tests_dir = os.path.dirname(os.path.abspath(__file__))
-        self.bin_rpm = os.path.join(
-            tests_dir, 'materials', 'pkg-1.0-1.noarch.rpm'
-        )
-        self.src_rpm = os.path.join(
-            tests_dir, 'materials', 'pkg-1.0-1.src.rpm'
-        )
+        self.bin_rpm = os.path.join(MATERIALS_DIR, 'pkg-1.0-1.noarch.rpm')
+        self.src_rpm = os.path.join(MATERIALS_DIR, 'pkg-1.0-1.src.rpm')
 
     def test_load(self):
         """RPM initializer works with bin/src RPM with/without conf."""
@@ -294,20 +344,17 @@ class RPMTest(RiftProjectTestCase):
     def test_extract_srpm(self):
         """RPM.extract_srpm() extracts files from source RPM."""
         rpm = RPM(self.src_rpm, self.config)
-        specdir = make_temp_dir()
-        srcdir = make_temp_dir()
-
-        # Extract source RPM
-        rpm.extract_srpm(specdir, srcdir)
-
-        # Verify files have been properly extracted
-        for spec in ['pkg.spec', 'pkg.spec.orig']:
-            self.assertTrue(os.path.exists(os.path.join(specdir, spec)))
-        self.assertTrue(os.path.exists(os.path.join(srcdir, 'pkg-1.0.tar.gz')))
-
-        # Clean up everything
-        shutil.rmtree(specdir)
-        shutil.rmtree(srcdir)
+        with tempfile.TemporaryDirectory(prefix='rift-test-') as specdir, \
+             tempfile.TemporaryDirectory(prefix='rift-test-') as srcdir:
+            # Extract source RPM
+            rpm.extract_srpm(specdir, srcdir)
+
+            # Verify files have been properly extracted
+            for spec in ['pkg.spec', 'pkg.spec.orig']:
+                self.assertTrue(os.path.exists(os.path.join(specdir, spec)))
+            self.assertTrue(
+                os.path.exists(os.path.join(srcdir, 'pkg-1.0.tar.gz'))
+            )
 
     def test_extract_srpm_on_bin(self):
         """RPM.extract_srpm() raises assertion error with binary RPM."""
@@ -346,12 +393,14 @@ class RPMTest(RiftProjectTestCase):
 
     def sign_copy(self, gpg_passphrase, rpm_pkg, conf_passphrase=None, preset_passphrase=None):
         """
-        Generate keyring with provided gpg passphrase, update configuration with
-        generated keyring, copy unsigned rpm_pkg, sign it, verify signature and
-        cleanup everything.
+        Copy keyring with provided gpg passphrase, update configuration with
+        this keyring, copy unsigned rpm_pkg, sign it and verify signature.
         """
         gpg_home = os.path.join(self.projdir, '.gnupg')
 
+        # Copy keyring generated once for all tests with this passphrase
+        copy_gpg_keyring(gpg_home, gpg_passphrase)
+
         # Launch the agent with --allow-preset-passphrase to accept passphrase
         # provided non-interactively by gpg-preset-passphrase.
         cmd = [
@@ -363,25 +412,10 @@ class RPMTest(RiftProjectTestCase):
         ]
         subprocess.run(cmd)
 
-        # Generate keyring
-        gpg_key = 'rift'
-        cmd = [
-            'gpg',
-            '--homedir',
-            gpg_home,
-            '--batch',
-            '--passphrase',
-            gpg_passphrase or '',
-            '--quick-generate-key',
-            gpg_key,
-        ]
-        subprocess.run(cmd)
-
         # If preset passphrase is provided, add it to the agent
         # non-interactively with gpg-preset-passphrase.
         if preset_passphrase:
-            # First find keygrip
-            keygrip = None
+            # First find keygrip of primary key
             cmd = [
                 'gpg',
                 '--homedir',
@@ -389,13 +423,15 @@ class RPMTest(RiftProjectTestCase):
                 '--fingerprint',
                 '--with-keygrip',
                 '--with-colons',
-                gpg_key
+                GPG_KEY
             ]
             proc = subprocess.run(cmd, stdout=subprocess.PIPE)
-            for line in proc.stdout.decode().split('\n'):
-                if line.startswith('grp'):
-                    keygrip = line.split(':')[9]
-                    break
+            output = proc.stdout.decode()
+            match = GPG_KEYGRIP_RE.search(output)
+            self.assertIsNotNone(
+                match, f"Unable to find key keygrip in gpg output: {output}"
+            )
+            keygrip = match.group(1)
             # Run gpg-preset-passphrase to add passphrase in agent
             cmd = ['/usr/libexec/gpg-preset-passphrase', '--preset', keygrip]
             subprocess.run(
@@ -409,7 +445,7 @@ class RPMTest(RiftProjectTestCase):
             {
                 'gpg': {
                     'keyring': gpg_home,
-                    'key': gpg_key,
+                    'key': GPG_KEY,
                 }
             }
         )
@@ -426,23 +462,17 @@ class RPMTest(RiftProjectTestCase):
         rpm = RPM(rpm_copy, self.config)
         self.assertFalse(rpm.is_signed)
         try:
-            os.environ['GNUPGHOME'] = gpg_home
-            rpm.sign()
-            del os.environ['GNUPGHOME']
+            with patch.dict(os.environ, {'GNUPGHOME': gpg_home}):
+                rpm.sign()
             # Reload RPM package and check signature
             rpm._load()
             self.assertTrue(rpm.is_signed)
         finally:
-            # Remove signed copy of RPM package and keyring
-            os.remove(rpm_copy)
-
-            # Kill GPG agent launched for the test
+            # Kill GPG agent launched for the test. The signed copy of RPM
+            # package and the GPG home are removed with the project directory.
             cmd = ['gpgconf', '--homedir', gpg_home, '--kill', 'gpg-agent']
             subprocess.run(cmd)
 
-            # Remove temporary GPG home with generated key
-            shutil.rmtree(gpg_home)
-
     def test_sign_src_rpm(self):
         """Source RPM package signature."""
         self.sign_copy('TOPSECRET', self.src_rpm, 'TOPSECRET')
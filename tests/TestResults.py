@@ -88,7 +88,7 @@ class TestResultsTest(RiftTestCase):
         )
         output = BytesIO()
         results.junit(output)
-        root = ET.fromstring(output.getvalue().decode())
+        root = ET.fromstring(output.getvalue())
         self.assertEqual(root.tag, 'testsuite')
         self.assertEqual(root.attrib, { 'tests': '2'})
         self.assertEqual(len(root.findall('*')), 2)
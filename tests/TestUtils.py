@@ -10,16 +10,18 @@ It contains several helper methods or classes like temporary file management.
 from collections import OrderedDict
 from collections import namedtuple
 from contextlib import contextmanager
+import copy
 import io
 import jinja2
-import logging
 import os
 import pathlib as pl
 import shutil
+import subprocess
 import tarfile
 import tempfile
 import time
 import unittest
+from unittest.mock import patch
 import yaml
 
 from rift.Config import Config, Staff, Modules
@@ -191,22 +193,35 @@ class RiftProjectTestCase(RiftTestCase):
     """
 
     def setUp(self):
-        self.cwd = os.getcwd()
-        self.projdir = make_temp_dir()
+        super().setUp()
+        self._create_project(self)
+
+    def tearDown(self):
+        self._remove_project(self)
+        super().tearDown()
+
+    @staticmethod
+    def _create_project(owner):
+        """
+        Create the dummy project tree and set its attributes on owner, either
+        a test case instance or a test case class.
+        """
+        owner.cwd = os.getcwd()
+        owner.projdir = make_temp_dir()
         # ./packages/
-        self.packagesdir = os.path.join(self.projdir, 'packages')
-        os.mkdir(self.packagesdir)
+        owner.packagesdir = os.path.join(owner.projdir, 'packages')
+        os.mkdir(owner.packagesdir)
         # ./packages/staff.yaml
-        self.staffpath = os.path.join(self.packagesdir, 'staff.yaml')
-        with open(self.staffpath, "w") as staff:
+        owner.staffpath = os.path.join(owner.packagesdir, 'staff.yaml')
+        with open(owner.staffpath, "w") as staff:
             staff.write(
                 "staff:\n"
                 "  Myself: {email: buddy@somewhere.org}\n"
                 "  Another: {email: another@elsewhere.org}\n"
             )
         # ./packages/modules.yaml
-        self.modulespath = os.path.join(self.packagesdir, 'modules.yaml')
-        with open(self.modulespath, "w") as mod:
+        owner.modulespath = os.path.join(owner.packagesdir, 'modules.yaml')
+        with open(owner.modulespath, "w") as mod:
             mod.write(
                 "modules:\n"
                 "  Great module:\n"
@@ -215,47 +230,49 @@ class RiftProjectTestCase(RiftTestCase):
                 "    manager: Another\n"
             )
         # ./annex/
-        self.annexdir = os.path.join(self.projdir, 'annex')
-        os.mkdir(self.annexdir)
+        owner.annexdir = os.path.join(owner.projdir, 'annex')
+        os.mkdir(owner.annexdir)
         # ./project.conf
-        self.projectconf = os.path.join(self.projdir, Config._DEFAULT_FILES[0])
-        with open(self.projectconf, "w") as conf:
+        owner.projectconf = os.path.join(owner.projdir, Config._DEFAULT_FILES[0])
+        with open(owner.projectconf, "w") as conf:
             conf.write("set_annex:\n")
-            conf.write("  address:       %s\n" % self.annexdir)
+            conf.write("  address:       %s\n" % owner.annexdir)
             conf.write("  type:          directory\n")
             conf.write("vm:\n")
             conf.write("  image:         test.img\n")
             conf.write("repos:           {}\n")
-        os.chdir(self.projdir)
+        os.chdir(owner.projdir)
         # Dict of created packages
-        self.pkgdirs = {}
-        self.buildfiles = {}
-        self.pkgsrc = {}
-        self.tests = {}
+        owner.pkgdirs = {}
+        owner.buildfiles = {}
+        owner.pkgsrc = {}
+        owner.tests = {}
         # Load project/staff/modules
-        self.config = Config()
-        self.config.load()
-        self.staff = Staff(config=self.config)
-        self.staff.load(self.staffpath)
-        self.modules = Modules(config=self.config, staff=self.staff)
-        self.modules.load(self.modulespath)
+        owner.config = Config()
+        owner.config.load()
+        owner.staff = Staff(config=owner.config)
+        owner.staff.load(owner.staffpath)
+        owner.modules = Modules(config=owner.config, staff=owner.staff)
+        owner.modules.load(owner.modulespath)
         # ./mock.tpl
-        self.mocktpl = os.path.join(self.projdir, Mock.MOCK_TEMPLATE)
-        with open(self.mocktpl, "w") as fh:
+        owner.mocktpl = os.path.join(owner.projdir, Mock.MOCK_TEMPLATE)
+        with open(owner.mocktpl, "w") as fh:
             fh.write(MOCK_CONF)
 
-    def tearDown(self):
-        os.chdir(self.cwd)
-        os.unlink(self.projectconf)
-        os.unlink(self.staffpath)
-        os.unlink(self.modulespath)
-        os.unlink(self.mocktpl)
-        os.rmdir(self.annexdir)
-        for buildfile in self.buildfiles.values():
+    @staticmethod
+    def _remove_project(owner):
+        """Remove the dummy project tree created for owner."""
+        os.chdir(owner.cwd)
+        os.unlink(owner.projectconf)
+        os.unlink(owner.staffpath)
+        os.unlink(owner.modulespath)
+        os.unlink(owner.mocktpl)
+        os.rmdir(owner.annexdir)
+        for buildfile in owner.buildfiles.values():
             os.unlink(buildfile)
-        for src in self.pkgsrc.values():
+        for src in owner.pkgsrc.values():
             os.unlink(src)
-        for pkgdir in self.pkgdirs.values():
+        for pkgdir in owner.pkgdirs.values():
             info_path = os.path.join(pkgdir, 'info.yaml')
             if os.path.exists(info_path):
                 os.unlink(info_path)
@@ -267,30 +284,44 @@ class RiftProjectTestCase(RiftTestCase):
             os.rmdir(pkgdir)
         # Remove potentially generated files for VM related tests
         for path in [
-            self.config.project_path(
-                self.config.get('vm').get('cloud_init_tpl')
+            owner.config.project_path(
+                owner.config.get('vm').get('cloud_init_tpl')
             ),
-            self.config.project_path(
-                self.config.get('vm').get('build_post_script')
+            owner.config.project_path(
+                owner.config.get('vm').get('build_post_script')
             ),
-            self.config.project_path(self.config.get('vm').get('image')),
+            owner.config.project_path(owner.config.get('vm').get('image')),
         ]:
             if os.path.exists(path):
                 os.unlink(path)
-        shutil.rmtree(self.projdir)
+        shutil.rmtree(owner.projdir)
 
     def update_project_conf(self):
         """Update project YAML configuration file with new Config options."""
-        class OrderedDumper(yaml.SafeDumper):
-            pass
-        def _dict_representer(dumper, data):
-            return dumper.represent_mapping(
-                yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG,
-                data.items()
-            )
-        OrderedDumper.add_representer(OrderedDict, _dict_representer)
         with open(self.projectconf, 'w') as fh:
-            fh.write(yaml.dump(self.config.options, Dumper=OrderedDumper))
+            fh.write(dump_project_conf(self.config.options))
+
+    @contextmanager
+    def config_override(self, options):
+        """
+        Set options in Config and make rift.Controller use this Config object
+        as is, without writing and loading again project YAML configuration
+        file. Config options are restored when leaving the context.
+        """
+        saved_options = copy.deepcopy(self.config.options)
+        # Set arch first, as when Config is loaded, because other options can
+        # be architecture specific.
+        if 'arch' in options:
+            self.config.set('arch', options['arch'])
+        for key, value in options.items():
+            if key != 'arch':
+                self.config.set(key, value)
+        try:
+            with patch('rift.Controller.Config', return_value=self.config), \
+                    patch.object(self.config, 'load'):
+                yield
+        finally:
+            self.config.options = saved_options
 
     def make_pkg(
         self,
@@ -457,15 +488,60 @@ class RiftProjectTestCase(RiftTestCase):
         if not os.path.exists(cache_dir):
             os.mkdir(cache_dir)
 
+class RiftProjectSharedTestCase(RiftProjectTestCase):
+    """
+    RiftProjectTestCase that setup the dummy project tree once for all the
+    tests of the class. Tests must not modify the project tree.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls._create_project(cls)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._remove_project(cls)
+        super().tearDownClass()
+
+    def setUp(self):
+        # Skip RiftProjectTestCase per test project creation, the project is
+        # created in setUpClass().
+        super(RiftProjectTestCase, self).setUp()
+
+    def tearDown(self):
+        super(RiftProjectTestCase, self).tearDown()
+
+#
+# Project configuration
+#
+class _OrderedDumper(yaml.SafeDumper):
+    """YAML dumper which represents OrderedDict as regular mappings."""
+
+def _dict_representer(dumper, data):
+    return dumper.represent_mapping(
+        yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG,
+        data.items()
+    )
+
+_OrderedDumper.add_representer(OrderedDict, _dict_representer)
+
+def dump_project_conf(options):
+    """Return YAML serialization of project configuration options dict."""
+    return yaml.dump(options, Dumper=_OrderedDumper)
+
 #
 # RPM spec file
 #
+_SPEC_TEMPLATE = jinja2.Template(SPEC_TPL)
+
 def gen_rpm_spec(**kwargs):
-    return jinja2.Template(SPEC_TPL).render(**kwargs)
+    return _SPEC_TEMPLATE.render(**kwargs)
 
 def read_file(filepath):
     """Read a text file and return its content."""
-    return open(filepath).read()
+    with open(filepath) as fh:
+        return fh.read()
 
 def host_rpmlint(filepath, configdir=None):
     """
@@ -484,9 +560,18 @@ def host_rpmlint(filepath, configdir=None):
 #
 # Temp files
 #
-def make_temp_dir():
-    """Create and return the name of a temporary directory."""
-    return tempfile.mkdtemp(prefix='rift-test-')
+TMPFS_DIR = '/dev/shm'
+
+def make_temp_dir(parent=None):
+    """
+    Create and return the name of a temporary directory, in parent directory if
+    provided. When RIFT_TEST_TMPFS environment variable is defined, temporary
+    directories are created in /dev/shm tmpfs by default, if available.
+    """
+    if (parent is None and os.environ.get('RIFT_TEST_TMPFS')
+            and os.path.isdir(TMPFS_DIR)):
+        parent = TMPFS_DIR
+    return tempfile.mkdtemp(prefix='rift-test-', dir=parent)
 
 def make_temp_filename():
     """Return a temporary name for a file."""
@@ -501,6 +586,54 @@ def make_temp_file(text, delete=True, suffix=None):
     return tmp
 
 
+#
+# GPG keyrings
+#
+GPG_KEY = 'rift'
+
+# GPG keyrings generated by tests modules, indexed by key passphrase. RSA key
+# generation is slow, then keyrings are generated once and removed by
+# remove_gpg_keyrings() in tearDownModule() of modules that use them.
+_GPG_KEYRINGS = {}
+
+def copy_gpg_keyring(gpg_home, passphrase=None):
+    """
+    Copy in gpg_home a GPG keyring with GPG_KEY protected by the provided
+    passphrase. The keyring is generated at first call with this passphrase.
+    """
+    if passphrase not in _GPG_KEYRINGS:
+        keyring = make_temp_dir()
+        try:
+            cmd = [
+                'gpg',
+                '--homedir',
+                keyring,
+                '--batch',
+                '--passphrase',
+                passphrase or '',
+                '--quick-generate-key',
+                GPG_KEY,
+            ]
+            subprocess.run(cmd, check=True)
+            # Kill GPG agent automatically launched for key generation
+            cmd = ['gpgconf', '--homedir', keyring, '--kill', 'gpg-agent']
+            subprocess.run(cmd, check=True)
+        except subprocess.CalledProcessError:
+            # Do not keep partial keyring for next calls
+            shutil.rmtree(keyring, ignore_errors=True)
+            raise
+        _GPG_KEYRINGS[passphrase] = keyring
+    # Skip possible remaining agent sockets
+    shutil.copytree(_GPG_KEYRINGS[passphrase], gpg_home,
+                    ignore=shutil.ignore_patterns('S.*'))
+
+def remove_gpg_keyrings():
+    """Remove all GPG keyrings generated by copy_gpg_keyring()."""
+    while _GPG_KEYRINGS:
+        _, keyring = _GPG_KEYRINGS.popitem()
+        shutil.rmtree(keyring, ignore_errors=True)
+
+
 #
 # Context managers
 #
@@ -422,6 +422,118 @@ class GraphTest(RiftProjectTestCase):
                 self.assertIsInstance(build_requirement.package, PackageRPM)
             self.assertEqual(len(build_requirements), 3)
 
+    def _load_graph(self):
+        """Return the dependency graph of all project packages."""
+        # mock Mock.read_spec to return spec file content directly read on host
+        with patch('rift.package.rpm.Mock') as mock_mock:
+            mock_mock.return_value.read_spec = read_file
+            return PackagesDependencyGraph.from_project(
+                self.config,
+                self.staff,
+                self.modules
+            )
+
+    def _solve_names(self, graph, name):
+        """
+        Solve build requirements of the given package in graph and return the
+        list of packages names and the dict of reasons indexed by package name.
+        """
+        build_requirements = graph.solve(
+            PackageRPM(name, self.config, self.staff, self.modules)
+        )
+        return (
+            [build_requirement.package.name
+             for build_requirement in build_requirements],
+            {build_requirement.package.name: build_requirement.reasons
+             for build_requirement in build_requirements},
+        )
+
+    def test_diamond(self):
+        """ Test graph solve with diamond dependencies """
+        # libtwo and libthree depend on libone, my-software depends on both
+        # libtwo and libthree.
+        self.make_pkg(name='libone')
+        self.make_pkg(name='libtwo', metadata={'depends': 'libone'})
+        self.make_pkg(name='libthree', metadata={'depends': 'libone'})
+        self.make_pkg(
+            name='my-software',
+            metadata={'depends': ['libtwo', 'libthree']}
+        )
+        graph = self._load_graph()
+        with self.assertLogs(level='DEBUG') as cm:
+            names, reasons = self._solve_names(graph, 'libone')
+        self.assertEqual(names[0], 'libone')
+        self.assertCountEqual(names[1:3], ['libtwo', 'libthree'])
+        self.assertEqual(names[3], 'my-software')
+        self.assertEqual(reasons['libone'], ["User request"])
+        self.assertEqual(reasons['libtwo'], ["depends on rpm:libone"])
+        self.assertEqual(reasons['libthree'], ["depends on rpm:libone"])
+        # One reason per dependency of my-software, even though it is reached
+        # through two paths.
+        self.assertCountEqual(
+            reasons['my-software'],
+            ["depends on rpm:libtwo", "depends on rpm:libthree"]
+        )
+        # No dependency loop
+        self.assertFalse(
+            any('Dependency loop detected' in line for line in cm.output)
+        )
+
+    def test_loop_with_rdep(self):
+        """ Test graph solve with dependency loop and reverse dependency """
+        # Define 3 packages with a dependency loop and another package that
+        # depends on one package of the loop.
+        self.make_pkg(name='libone', metadata={'depends': 'libtwo'})
+        self.make_pkg(name='libtwo', metadata={'depends': 'libthree'})
+        self.make_pkg(name='libthree', metadata={'depends': 'libone'})
+        self.make_pkg(name='my-software', metadata={'depends': 'libtwo'})
+        graph = self._load_graph()
+        loop = {
+            'libone': 'libtwo',
+            'libtwo': 'libthree',
+            'libthree': 'libone',
+        }
+        for start, start_dep in loop.items():
+            with self.subTest(start=start):
+                names, reasons = self._solve_names(graph, start)
+                self.assertCountEqual(names, list(loop) + ['my-software'])
+                # Package outside the loop comes after all packages of the loop.
+                self.assertEqual(names[-1], 'my-software')
+                self.assertEqual(
+                    reasons['my-software'], ["depends on rpm:libtwo"]
+                )
+                # Start package is required by user and by the loop.
+                self.assertEqual(
+                    reasons[start],
+                    ["User request", f"depends on rpm:{start_dep}"]
+                )
+                for name, dep in loop.items():
+                    if name != start:
+                        self.assertEqual(
+                            reasons[name], [f"depends on rpm:{dep}"]
+                        )
+
+    def test_loop_logs(self):
+        """ Test graph solve logs each dependency loop once """
+        # Define 2 dependency loops, the second one depends on the first one.
+        self.make_pkg(name='liba', metadata={'depends': 'libb'})
+        self.make_pkg(name='libb', metadata={'depends': 'liba'})
+        self.make_pkg(name='libc', metadata={'depends': ['libd', 'libb']})
+        self.make_pkg(name='libd', metadata={'depends': 'libc'})
+        graph = self._load_graph()
+        with self.assertLogs(level='DEBUG') as cm:
+            names, _ = self._solve_names(graph, 'liba')
+        self.assertCountEqual(names[:2], ['liba', 'libb'])
+        self.assertCountEqual(names[2:], ['libc', 'libd'])
+        loops = [
+            line for line in cm.output if 'Dependency loop detected' in line
+        ]
+        self.assertEqual(len(loops), 2)
+        self.assertCountEqual(
+            [sorted(line.split(': ', 1)[1].split(', ')) for line in loops],
+            [['rpm:liba', 'rpm:libb'], ['rpm:libc', 'rpm:libd']]
+        )
+
     @patch('sys.stdout', new_callable=io.StringIO)
     def test_draw(self, mock_stdout):
         """ Test graph draw """
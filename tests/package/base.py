@@ -14,7 +14,13 @@ from rift.package._base import (
     ActionableArchPackage,
     Test,
 )
-from ..TestUtils import RiftProjectTestCase, PackageTestDef, make_temp_file
+from ..TestUtils import (
+    RiftTestCase,
+    RiftProjectTestCase,
+    RiftProjectSharedTestCase,
+    PackageTestDef,
+    make_temp_file,
+)
 from rift.Gerrit import Review
 
 
@@ -54,9 +60,9 @@ class ActionableArchPackageTestingConcrete(ActionableArchPackage):
         pass
 
 
-class PackageTest(RiftProjectTestCase):
+class PackageNoPkgTest(RiftProjectSharedTestCase):
     """
-    Tests class for Package
+    Tests class for Package without package in project
     """
 
     def test_init_abstract(self):
@@ -66,6 +72,82 @@ class PackageTest(RiftProjectTestCase):
         ):
             Package('pkg', self.config, self.staff, self.modules, 'fail', 'build.fail')
 
+    def test_init_invalid_format(self):
+        with self.assertRaisesRegex(RiftError, "^Unsupported package format fail$"):
+            PackageTestingConcrete('pkg', self.config, self.staff, self.modules, 'fail')
+
+    def test_load_exclude_archs(self):
+        """ Test Package exclude_archs loading with string or list """
+        pkg = PackageTestingConcrete(
+            'pkg', self.config, self.staff, self.modules, 'rpm'
+        )
+        for exclude_archs, expected in [
+            ('aarch64', ['aarch64']),
+            ('[x86_64, aarch64]', ['x86_64', 'aarch64']),
+        ]:
+            with self.subTest(exclude_archs=exclude_archs):
+                info = make_temp_file(
+                    textwrap.dedent(f"""\
+                        package:
+                            maintainers:
+                            - Myself
+                            module: Great module
+                            origin: Vendor
+                            reason: Missing feature
+                            exclude_archs: {exclude_archs}
+                        """)
+                )
+                pkg.load(infopath=info.name)
+                self.assertEqual(pkg.exclude_archs, expected)
+
+    def test_for_arch(self):
+        pkg = PackageTestingConcrete(
+            'pkg', self.config, self.staff, self.modules, 'rpm'
+        )
+        actionable_pkg = pkg.for_arch('x86_64')
+        self.assertIsInstance(actionable_pkg, ActionableArchPackageTestingConcrete)
+        self.assertEqual(actionable_pkg.name, 'pkg')
+        self.assertEqual(actionable_pkg.package, pkg)
+        self.assertEqual(actionable_pkg.buildfile, f"{pkg.dir}/{pkg.name}.buildfile")
+        self.assertEqual(actionable_pkg.config, self.config)
+        self.assertEqual(actionable_pkg.arch, 'x86_64')
+
+    def test_subpackages(self):
+        """ Test Package subpackages (dummy implementation) """
+        pkg = PackageTestingConcrete(
+            'pkg', self.config, self.staff, self.modules, 'rpm'
+        )
+        self.assertCountEqual(pkg.subpackages(), [])
+
+    def test_build_requires(self):
+        """ Test Package build requires (dummy implementation) """
+        pkg = PackageTestingConcrete(
+            'pkg', self.config, self.staff, self.modules, 'rpm'
+        )
+        self.assertCountEqual(pkg.build_requires(), [])
+
+    def test_add_changelog_entry(self):
+        """ Test Package add changelog entry (not implemented) """
+        pkg = PackageTestingConcrete(
+            'pkg', self.config, self.staff, self.modules, 'rpm'
+        )
+        with self.assertRaises(NotImplementedError):
+            pkg.add_changelog_entry("Myself", "Package modification", False)
+
+    def test_analyze(self):
+        """ Test Package analyze (not implemented) """
+        pkg = PackageTestingConcrete(
+            'pkg', self.config, self.staff, self.modules, 'rpm'
+        )
+        with self.assertRaises(NotImplementedError):
+            pkg.analyze(Review(), pkg.dir)
+
+
+class PackageTest(RiftProjectTestCase):
+    """
+    Tests class for Package
+    """
+
     def test_init_concrete(self):
         """ Test Package initialisation """
         pkgname = 'pkg'
@@ -82,10 +164,6 @@ class PackageTest(RiftProjectTestCase):
         self.assertEqual(pkg.format, 'rpm')
         self.assertEqual(pkg.buildfile, f"{pkg.dir}/{pkgname}.buildfile")
 
-    def test_init_invalid_format(self):
-        with self.assertRaisesRegex(RiftError, "^Unsupported package format fail$"):
-            PackageTestingConcrete('pkg', self.config, self.staff, self.modules, 'fail')
-
     def test_load(self):
         """ Test Package information loading """
         self.make_pkg(
@@ -99,20 +177,8 @@ class PackageTest(RiftProjectTestCase):
         self.assertEqual(pkg.maintainers, ['Myself'])
         self.assertEqual(pkg.reason, 'Missing feature')
         self.assertEqual(pkg.origin, 'Vendor')
-        self.assertCountEqual(pkg.depends, ['foo', 'bar'])
-        self.assertCountEqual(pkg.exclude_archs, ['aarch64'])
-
-    def test_for_arch(self):
-        pkg = PackageTestingConcrete(
-            'pkg', self.config, self.staff, self.modules, 'rpm'
-        )
-        actionable_pkg = pkg.for_arch('x86_64')
-        self.assertIsInstance(actionable_pkg, ActionableArchPackageTestingConcrete)
-        self.assertEqual(actionable_pkg.name, 'pkg')
-        self.assertEqual(actionable_pkg.package, pkg)
-        self.assertEqual(actionable_pkg.buildfile, f"{pkg.dir}/{pkg.name}.buildfile")
-        self.assertEqual(actionable_pkg.config, self.config)
-        self.assertEqual(actionable_pkg.arch, 'x86_64')
+        self.assertEqual(pkg.depends, ['foo', 'bar'])
+        self.assertEqual(pkg.exclude_archs, ['aarch64'])
 
     def test_tests(self):
         """ Test Package tests method """
@@ -148,38 +214,8 @@ class PackageTest(RiftProjectTestCase):
         self.assertCountEqual(
             [test.name for test in tests], ['0_test', '1_test'])
 
-    def test_subpackages(self):
-        """ Test Package subpackages (dummy implementation) """
-        pkg = PackageTestingConcrete(
-            'pkg', self.config, self.staff, self.modules, 'rpm'
-        )
-        self.assertCountEqual(pkg.subpackages(), [])
-
-    def test_build_requires(self):
-        """ Test Package build requires (dummy implementation) """
-        pkg = PackageTestingConcrete(
-            'pkg', self.config, self.staff, self.modules, 'rpm'
-        )
-        self.assertCountEqual(pkg.build_requires(), [])
-
-    def test_add_changelog_entry(self):
-        """ Test Package add changelog entry (not implemented) """
-        pkg = PackageTestingConcrete(
-            'pkg', self.config, self.staff, self.modules, 'rpm'
-        )
-        with self.assertRaises(NotImplementedError):
-            pkg.add_changelog_entry("Myself", "Package modification", False)
-
-    def test_analyze(self):
-        """ Test Package analyze (not implemented) """
-        pkg = PackageTestingConcrete(
-            'pkg', self.config, self.staff, self.modules, 'rpm'
-        )
-        with self.assertRaises(NotImplementedError):
-            pkg.analyze(Review(), pkg.dir)
-
 
-class ActionableArchPackageTest(RiftProjectTestCase):
+class ActionableArchPackageTest(RiftProjectSharedTestCase):
 
     def setUp(self):
         super().setUp()
@@ -234,7 +270,7 @@ class ActionableArchPackageTest(RiftProjectTestCase):
         actionable_pkg.clean()
 
 
-class TestTest(RiftProjectTestCase):
+class TestTest(RiftTestCase):
     def test_init(self):
         """ Test with command """
         command = make_temp_file(
@@ -29,6 +29,39 @@ class PackageRPMTest(RiftProjectTestCase):
     """
     Tests class for PackageRPM
     """
+    @classmethod
+    def setUpClass(cls):
+        # Package metadata file shared by all tests
+        cls.info_file = make_temp_file(textwrap.dedent("""
+            package:
+                maintainers:
+                - Myself
+                module: Great module
+                reason: Missing package
+                origin: Company
+            """))
+        # Spec files shared by tests which do not modify them, indexed by
+        # their generation arguments.
+        cls.spec_files = {}
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.info_file.close()
+        for spec_file in cls.spec_files.values():
+            spec_file.close()
+
+    def shared_spec_file(self, suffix=None, **kwargs):
+        """
+        Return path to spec file generated with gen_rpm_spec() kwargs, shared
+        with other tests of the class. Tests must not modify this file.
+        """
+        key = (suffix, tuple(sorted(kwargs.items())))
+        if key not in self.spec_files:
+            self.spec_files[key] = make_temp_file(
+                gen_rpm_spec(**kwargs), suffix=suffix
+            )
+        return self.spec_files[key].name
+
     def test_init(self):
         """ Test PackageRPM initialisation """
         pkgname = 'pkg'
@@ -59,16 +92,14 @@ class PackageRPMTest(RiftProjectTestCase):
                 - variant1
                 - variant2
             """))
-        spec_file = make_temp_file(
-            gen_rpm_spec(
-                name=pkgname,
-                version="1.0",
-                release="1",
-                arch="x86_64",
-                exclusive_arch="x86_64",
-            )
+        spec_file = self.shared_spec_file(
+            name=pkgname,
+            version="1.0",
+            release="1",
+            arch="x86_64",
+            exclusive_arch="x86_64",
         )
-        pkg.buildfile = spec_file.name
+        pkg.buildfile = spec_file
         # mock Mock.read_spec to return spec file content directly read on host
         with patch('rift.package.rpm.Mock') as mock_mock:
             mock_mock.return_value.read_spec = read_file
@@ -81,32 +112,22 @@ class PackageRPMTest(RiftProjectTestCase):
         """ Test PackageRPM.check() does not fail with error """
         pkgname = 'pkg'
         pkg = PackageRPM(pkgname, self.config, self.staff, self.modules)
-        pkgfile = make_temp_file(textwrap.dedent("""
-            package:
-                maintainers:
-                - Myself
-                module: Great module
-                reason: Missing package
-                origin: Company
-            """))
-        spec_file = make_temp_file(
-            gen_rpm_spec(
-                name=pkgname,
-                version="1.0",
-                release="1",
-                arch="x86_64",
-                exclusive_arch="x86_64",
-            )
+        spec_file = self.shared_spec_file(
+            name=pkgname,
+            version="1.0",
+            release="1",
+            arch="x86_64",
+            exclusive_arch="x86_64",
         )
         # Create sources dir and source
         sources_dir = os.path.join(pkg.dir, 'sources')
         os.makedirs(sources_dir)
         with open(os.path.join(sources_dir, "pkg-1.0.tar.gz"), 'w+') as fh:
             fh.write("data")
-        pkg.buildfile = spec_file.name
+        pkg.buildfile = spec_file
         with patch('rift.package.rpm.Mock') as mock_mock:
-            mock_mock.return_value.read_spec.return_value = open(spec_file.name).read()
-            pkg.load(infopath = pkgfile.name)
+            mock_mock.return_value.read_spec.return_value = read_file(spec_file)
+            pkg.load(infopath=self.info_file.name)
         with patch.object(pkg.spec.mock, 'rpmlint', host_rpmlint):
             pkg.check()
 
@@ -114,28 +135,18 @@ class PackageRPMTest(RiftProjectTestCase):
         """ Test PackageRPM.check() detect missing source """
         pkgname = 'pkg'
         pkg = PackageRPM(pkgname, self.config, self.staff, self.modules)
-        pkgfile = make_temp_file(textwrap.dedent("""
-            package:
-                maintainers:
-                - Myself
-                module: Great module
-                reason: Missing package
-                origin: Company
-            """))
-        spec_file = make_temp_file(
-            gen_rpm_spec(
-                name=pkgname,
-                version="1.0",
-                release="1",
-                arch="x86_64",
-                exclusive_arch="x86_64",
-            )
+        spec_file = self.shared_spec_file(
+            name=pkgname,
+            version="1.0",
+            release="1",
+            arch="x86_64",
+            exclusive_arch="x86_64",
         )
-        pkg.buildfile = spec_file.name
+        pkg.buildfile = spec_file
         # mock Mock.read_spec to return spec file content directly read on host
         with patch('rift.package.rpm.Mock') as mock_mock:
             mock_mock.return_value.read_spec = read_file
-            pkg.load(infopath = pkgfile.name)
+            pkg.load(infopath=self.info_file.name)
         with patch.object(pkg.spec.mock, 'rpmlint', host_rpmlint):
             with self.assertRaisesRegex(RiftError,
                 r'Missing source file\(s\): pkg-1.0.tar.gz'):
@@ -145,22 +156,12 @@ class PackageRPMTest(RiftProjectTestCase):
         """ Test PackageRPM.check() detect unused source """
         pkgname = 'pkg'
         pkg = PackageRPM(pkgname, self.config, self.staff, self.modules)
-        pkgfile = make_temp_file(textwrap.dedent("""
-            package:
-                maintainers:
-                - Myself
-                module: Great module
-                reason: Missing package
-                origin: Company
-            """))
-        spec_file = make_temp_file(
-            gen_rpm_spec(
-                name=pkgname,
-                version="1.0",
-                release="1",
-                arch="x86_64",
-                exclusive_arch="x86_64",
-            )
+        spec_file = self.shared_spec_file(
+            name=pkgname,
+            version="1.0",
+            release="1",
+            arch="x86_64",
+            exclusive_arch="x86_64",
         )
         # Create sources dir, source and unused source
         sources_dir = os.path.join(pkg.dir, 'sources')
@@ -169,11 +170,11 @@ class PackageRPMTest(RiftProjectTestCase):
             fh.write("data")
         with open(os.path.join(sources_dir, 'unused-1.0.tar.gz'), 'w+') as fh:
             fh.write("data")
-        pkg.buildfile = spec_file.name
+        pkg.buildfile = spec_file
         # mock Mock.read_spec to return spec file content directly read on host
         with patch('rift.package.rpm.Mock') as mock_mock:
             mock_mock.return_value.read_spec = read_file
-            pkg.load(infopath = pkgfile.name)
+            pkg.load(infopath=self.info_file.name)
         with patch.object(pkg.spec.mock, 'rpmlint', host_rpmlint):
             with self.assertRaisesRegex(RiftError,
                 r'Unused source file\(s\): unused-1.0.tar.gz'):
@@ -220,14 +221,6 @@ class PackageRPMTest(RiftProjectTestCase):
         """ Test PackageRPM add changelog entry"""
         pkgname = 'pkg'
         pkg = PackageRPM(pkgname, self.config, self.staff, self.modules)
-        pkgfile = make_temp_file(textwrap.dedent("""
-            package:
-                maintainers:
-                - Myself
-                module: Great module
-                reason: Missing package
-                origin: Company
-            """))
         spec_file = make_temp_file(
             gen_rpm_spec(
                 name=pkgname,
@@ -241,25 +234,17 @@ class PackageRPMTest(RiftProjectTestCase):
         # mock Mock.read_spec to return spec file content directly read on host
         with patch('rift.package.rpm.Mock') as mock_mock:
             mock_mock.return_value.read_spec = read_file
-            pkg.load(infopath = pkgfile.name)
+            pkg.load(infopath=self.info_file.name)
         pkg.add_changelog_entry("Myself", "Package modification", False)
         with patch('rift.package.rpm.Mock') as mock_mock:
             mock_mock.return_value.read_spec = read_file
-            pkg.load(infopath = pkgfile.name)
+            pkg.load(infopath=self.info_file.name)
         self.assertEqual(pkg.spec.changelog_name, "Myself <buddy@somewhere.org> - 1.0-1")
 
     def test_add_changelog_entry_bump(self):
         """ Test PackageRPM add changelog entry with release bump"""
         pkgname = 'pkg'
         pkg = PackageRPM(pkgname, self.config, self.staff, self.modules)
-        pkgfile = make_temp_file(textwrap.dedent("""
-            package:
-                maintainers:
-                - Myself
-                module: Great module
-                reason: Missing package
-                origin: Company
-            """))
         spec_file = make_temp_file(
             gen_rpm_spec(
                 name=pkgname,
@@ -273,25 +258,17 @@ class PackageRPMTest(RiftProjectTestCase):
         # mock Mock.read_spec to return spec file content directly read on host
         with patch('rift.package.rpm.Mock') as mock_mock:
             mock_mock.return_value.read_spec = read_file
-            pkg.load(infopath = pkgfile.name)
+            pkg.load(infopath=self.info_file.name)
         pkg.add_changelog_entry("Myself", "Package modification", True)
         with patch('rift.package.rpm.Mock') as mock_mock:
             mock_mock.return_value.read_spec = read_file
-            pkg.load(infopath = pkgfile.name)
+            pkg.load(infopath=self.info_file.name)
         self.assertEqual(pkg.spec.changelog_name, "Myself <buddy@somewhere.org> - 1.0-2")
 
     def test_add_changelog_entry_unknown_maintainer(self):
         """ Test PackageRPM add changelog entry with unknown maintainer """
         pkgname = 'pkg'
         pkg = PackageRPM(pkgname, self.config, self.staff, self.modules)
-        pkgfile = make_temp_file(textwrap.dedent("""
-            package:
-                maintainers:
-                - Myself
-                module: Great module
-                reason: Missing package
-                origin: Company
-            """))
         spec_file = make_temp_file(
             gen_rpm_spec(
                 name=pkgname,
@@ -305,7 +282,7 @@ class PackageRPMTest(RiftProjectTestCase):
         # mock Mock.read_spec to return spec file content directly read on host
         with patch('rift.package.rpm.Mock') as mock_mock:
             mock_mock.return_value.read_spec = read_file
-            pkg.load(infopath = pkgfile.name)
+            pkg.load(infopath=self.info_file.name)
         with self.assertRaisesRegex(
             RiftError, "Unknown maintainer Unknown, cannot be found in staff"
         ):
@@ -329,28 +306,18 @@ class PackageRPMTest(RiftProjectTestCase):
         """ Test PackageRPM supports_arch() method with ExclusiveArch"""
         pkgname = 'pkg'
         pkg = PackageRPM(pkgname, self.config, self.staff, self.modules)
-        pkgfile = make_temp_file(textwrap.dedent("""
-            package:
-                maintainers:
-                - Myself
-                module: Great module
-                reason: Missing package
-                origin: Company
-            """))
-        spec_file = make_temp_file(
-            gen_rpm_spec(
-                name=pkgname,
-                version="1.0",
-                release="1",
-                arch="x86_64",
-                exclusive_arch="x86_64",
-            )
+        spec_file = self.shared_spec_file(
+            name=pkgname,
+            version="1.0",
+            release="1",
+            arch="x86_64",
+            exclusive_arch="x86_64",
         )
-        pkg.buildfile = spec_file.name
+        pkg.buildfile = spec_file
         # mock Mock.read_spec to return spec file content directly read on host
         with patch('rift.package.rpm.Mock') as mock_mock:
             mock_mock.return_value.read_spec = read_file
-            pkg.load(infopath = pkgfile.name)
+            pkg.load(infopath=self.info_file.name)
         self.assertTrue(pkg.supports_arch('x86_64'))
         self.assertFalse(pkg.supports_arch('aarch64'))
 
@@ -358,27 +325,17 @@ class PackageRPMTest(RiftProjectTestCase):
         """ Test PackageRPM supports_arch() method without ExclusiveArch"""
         pkgname = 'pkg'
         pkg = PackageRPM(pkgname, self.config, self.staff, self.modules)
-        pkgfile = make_temp_file(textwrap.dedent("""
-            package:
-                maintainers:
-                - Myself
-                module: Great module
-                reason: Missing package
-                origin: Company
-            """))
-        spec_file = make_temp_file(
-            gen_rpm_spec(
-                name=pkgname,
-                version="1.0",
-                release="1",
-                arch="x86_64",
-            )
+        spec_file = self.shared_spec_file(
+            name=pkgname,
+            version="1.0",
+            release="1",
+            arch="x86_64",
         )
-        pkg.buildfile = spec_file.name
+        pkg.buildfile = spec_file
         # mock Mock.read_spec to return spec file content directly read on host
         with patch('rift.package.rpm.Mock') as mock_mock:
             mock_mock.return_value.read_spec = read_file
-            pkg.load(infopath = pkgfile.name)
+            pkg.load(infopath=self.info_file.name)
         self.assertTrue(pkg.supports_arch('x86_64'))
         self.assertTrue(pkg.supports_arch('aarch64'))
 
@@ -386,28 +343,18 @@ class PackageRPMTest(RiftProjectTestCase):
         """ Test PackageRPM analyze success """
         pkgname = 'pkg'
         pkg = PackageRPM(pkgname, self.config, self.staff, self.modules)
-        pkgfile = make_temp_file(textwrap.dedent("""
-            package:
-                maintainers:
-                - Myself
-                module: Great module
-                reason: Missing package
-                origin: Company
-            """))
-        spec_file = make_temp_file(
-            gen_rpm_spec(
-                name=pkgname,
-                version="1.0",
-                release="1",
-                arch="x86_64",
-            ),
-            suffix='.spec'
+        spec_file = self.shared_spec_file(
+            name=pkgname,
+            version="1.0",
+            release="1",
+            arch="x86_64",
+            suffix='.spec',
         )
-        pkg.buildfile = spec_file.name
+        pkg.buildfile = spec_file
         # mock Mock.read_spec to return spec file content directly read on host
         with patch('rift.package.rpm.Mock') as mock_mock:
             mock_mock.return_value.read_spec = read_file
-            pkg.load(infopath = pkgfile.name)
+            pkg.load(infopath=self.info_file.name)
         review = Mock(spec=Review)
         with patch.object(pkg.spec.mock, 'rpmlint', host_rpmlint):
             pkg.analyze(review, pkg.dir)
@@ -417,31 +364,21 @@ class PackageRPMTest(RiftProjectTestCase):
         """ Test PackageRPM analyze failure """
         pkgname = 'pkg'
         pkg = PackageRPM(pkgname, self.config, self.staff, self.modules)
-        pkgfile = make_temp_file(textwrap.dedent("""
-            package:
-                maintainers:
-                - Myself
-                module: Great module
-                reason: Missing package
-                origin: Company
-            """))
         # Use $$RPM_SOURCE_DIR and $RPM_BUILD_ROOT in build steps in order to
         # produce error in both rpmlint v1 and v2.
-        spec_file = make_temp_file(
-            gen_rpm_spec(
-                name=pkgname,
-                version="1.0",
-                release="1",
-                arch="x86_64",
-                buildsteps="$RPM_SOURCE_DIR\n$RPM_BUILD_ROOT",
-            ),
-            suffix='.spec'
+        spec_file = self.shared_spec_file(
+            name=pkgname,
+            version="1.0",
+            release="1",
+            arch="x86_64",
+            buildsteps="$RPM_SOURCE_DIR\n$RPM_BUILD_ROOT",
+            suffix='.spec',
         )
-        pkg.buildfile = spec_file.name
+        pkg.buildfile = spec_file
         # mock Mock.read_spec to return spec file content directly read on host
         with patch('rift.package.rpm.Mock') as mock_mock:
             mock_mock.return_value.read_spec = read_file
-            pkg.load(infopath = pkgfile.name)
+            pkg.load(infopath=self.info_file.name)
         review = Mock(spec=Review)
         with patch.object(pkg.spec.mock, 'rpmlint', host_rpmlint):
             pkg.analyze(review, pkg.dir)
@@ -3,10 +3,9 @@
 #
 
 import os
-import shutil
 from unittest.mock import Mock
 
-from ..TestUtils import make_temp_dir, RiftTestCase
+from ..TestUtils import RiftTestCase
 
 from rift import RiftError
 from rift.Config import Config
@@ -23,7 +22,9 @@ class ProjectArchRepositoriesTest(RiftTestCase):
 
     def test_working_with_arch(self):
         """Test working repo with $arch placeholder and arch specific value"""
-        working_repo_path = make_temp_dir()
+        # Working repository paths are only computed, they do not have to
+        # exist.
+        working_repo_path = '/rift/working'
         self.config.options['working_repo'] = os.path.join(
                 working_repo_path, '$arch'
         )
@@ -37,7 +38,7 @@ class ProjectArchRepositoriesTest(RiftTestCase):
         # configuration, it should override generic working_repo parameter for
         # this arch.
 
-        other_working_repo_path = make_temp_dir()
+        other_working_repo_path = '/rift/other-working'
         # Declare supported architectures.
         self.config.options['arch'] = ['x86_64', 'aarch64']
         self.config.options['x86_64'] = {
@@ -49,16 +50,13 @@ class ProjectArchRepositoriesTest(RiftTestCase):
         self.assertEqual(
             repos.working_dir, os.path.join(working_repo_path, 'aarch64')
         )
-        shutil.rmtree(working_repo_path)
-        shutil.rmtree(other_working_repo_path)
 
     def test_can_publish(self):
         """Test ProjectArchRepositories.can_publish() with working_repo"""
-        working_repo_path = make_temp_dir()
+        working_repo_path = '/rift/working'
         self.config.options['working_repo'] = working_repo_path
         repos = ProjectArchRepositories(self.config, 'x86_64')
         self.assertTrue(repos.can_publish())
-        shutil.rmtree(working_repo_path)
 
     def test_cannot_publish(self):
         """Test ProjectArchRepositories.can_publish() without working_repo"""
@@ -7,6 +7,7 @@ import shutil
 from unittest.mock import Mock, call, patch
 
 from ..TestUtils import make_temp_dir, read_file, RiftTestCase
+import rift.repository.rpm
 from rift.repository.rpm import (
     ConsumableRepository,
     LocalRepository,
@@ -17,11 +18,57 @@ from rift.Config import _DEFAULT_REPO_CMD, _DEFAULT_REPOS_VARIANTS, Config
 from rift.RPM import RPM
 from rift import RiftError
 
+MATERIALS_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'materials'
+)
+
+# Emulate successful createrepo executions in all tests of this module, the
+# tests do not check repositories metadata.
+_CREATEREPO_PATCHER = patch('rift.repository.rpm.Popen')
+
+
+def set_createrepo_result(mock_popen, returncode, output=None):
+    """Set emulated createrepo return code and output on Popen mock."""
+    popen = mock_popen.return_value.__enter__.return_value
+    popen.returncode = returncode
+    popen.communicate.return_value = [output]
+
+
+def setUpModule():
+    set_createrepo_result(_CREATEREPO_PATCHER.start(), 0)
+
+
+def tearDownModule():
+    _CREATEREPO_PATCHER.stop()
+
 
 class LocalRepositoryTest(RiftTestCase):
     """
     Tests class for Repository
     """
+    @classmethod
+    def setUpClass(cls):
+        # Parent of temporary directories created by tests, removed with all
+        # its content when all tests of the class are done.
+        cls.tmp_dir = make_temp_dir()
+        # Load source and binary packages from tests materials once, they are
+        # only copied by repositories.
+        cls.src_rpm = RPM(os.path.join(MATERIALS_DIR, 'pkg-1.0-1.src.rpm'))
+        cls.bin_rpm = RPM(os.path.join(MATERIALS_DIR, 'pkg-1.0-1.noarch.rpm'))
+        # Repository populated with packages from tests materials, shared by
+        # tests that do not modify it.
+        shared_config = Config()
+        shared_config.update({ 'arch': ['x86_64', 'aarch64'] })
+        cls.shared_repo = LocalRepository(
+            make_temp_dir(cls.tmp_dir), shared_config
+        )
+        cls.shared_repo.create()
+        cls._add_packages(cls.shared_repo)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_dir)
+
     def setUp(self):
         self.config = Config()
 
@@ -92,43 +139,48 @@ class LocalRepositoryTest(RiftTestCase):
         ):
             repo.rpms_dir('fail')
 
-    @patch('rift.repository.rpm.Popen')
-    def test_create(self, mock_popen):
+    def _mock_createrepo(self, returncode=0, output=None):
+        """
+        Reset module Popen mock and emulate createrepo execution with the
+        given return code and output until the end of the test. Return the
+        mock.
+        """
+        mock_popen = rift.repository.rpm.Popen
+        mock_popen.reset_mock()
+        set_createrepo_result(mock_popen, returncode, output)
+        self.addCleanup(set_createrepo_result, mock_popen, 0)
+        return mock_popen
+
+    def _make_repo(self, archs=('x86_64',)):
+        """
+        Return LocalRepository for the given architectures in a new temporary
+        directory.
+        """
+        self.config.update({ 'arch': list(archs) })
+        return LocalRepository(make_temp_dir(self.tmp_dir), self.config)
+
+    def test_create(self):
         """ Test LocalRepository create """
         # Emulate successful createrepo execution
-        mock_popen.return_value.__enter__.return_value.returncode = 0
-        arch = 'x86_64'
-        self.config.update({ 'arch': [arch] })
-        local_repo_path = make_temp_dir()
-        repo = LocalRepository(local_repo_path, self.config)
+        self._mock_createrepo()
+        repo = self._make_repo()
         repo.create()
         self.assertTrue(os.path.exists(repo.srpms_dir))
-        self.assertTrue(os.path.exists(repo.rpms_dir(arch)))
-        shutil.rmtree(local_repo_path)
+        self.assertTrue(os.path.exists(repo.rpms_dir('x86_64')))
 
-    @patch('rift.repository.rpm.Popen')
-    def test_create_failure(self, mock_popen):
+    def test_create_failure(self):
         """ Test LocalRepository create failure """
         # Emulate createrepo execution failure
-        mock_popen.return_value.__enter__.return_value.returncode = 1
-        mock_popen.return_value.__enter__.return_value.communicate.return_value = ["output"]
-        arch = 'x86_64'
-        self.config.update({ 'arch': [arch] })
-        local_repo_path = make_temp_dir()
-        repo = LocalRepository(local_repo_path, self.config)
+        self._mock_createrepo(returncode=1, output="output")
+        repo = self._make_repo()
         with self.assertRaisesRegex(RiftError, '^output$'):
             repo.create()
-        shutil.rmtree(local_repo_path)
 
-    @patch('rift.repository.rpm.Popen')
-    def test_update(self, mock_popen):
+    def test_update(self):
         """ Test LocalRepository update """
         # Emulate successful createrepo execution
-        mock_popen.return_value.__enter__.return_value.returncode = 0
-        arch = 'x86_64'
-        self.config.update({ 'arch': [arch] })
-        local_repo_path = make_temp_dir()
-        repo = LocalRepository(local_repo_path, self.config)
+        mock_popen = self._mock_createrepo()
+        repo = self._make_repo()
         repo.create()  # create() calls update()
         # createrepo must have been executed twice, one for SRPMS and the other
         # for x86_64.
@@ -137,51 +189,37 @@ class LocalRepositoryTest(RiftTestCase):
         mock_popen.reset_mock()
         repo.update()
         self.assertEqual(mock_popen.call_count, 2)
-        shutil.rmtree(local_repo_path)
 
-    @patch('rift.repository.rpm.Popen')
-    def test_update_failure(self, mock_popen):
+    def test_update_failure(self):
         """ Test LocalRepository update failure """
-        # Emulate createrepo execution failure
-        mock_popen.return_value.__enter__.return_value.returncode = 0
-        arch = 'x86_64'
-        self.config.update({ 'arch': [arch] })
-        local_repo_path = make_temp_dir()
-        repo = LocalRepository(local_repo_path, self.config)
+        # Emulate successful createrepo execution on create, then failure on
+        # update.
+        mock_popen = self._mock_createrepo()
+        repo = self._make_repo()
         repo.create()
-        mock_popen.return_value.__enter__.return_value.returncode = 1
-        mock_popen.return_value.__enter__.return_value.communicate.return_value = ["output"]
+        set_createrepo_result(mock_popen, 1, "output")
         with self.assertRaisesRegex(RiftError, '^output$'):
             repo.update()
-        shutil.rmtree(local_repo_path)
 
-    @staticmethod
-    def _add_packages(repo):
+    @classmethod
+    def _add_packages(cls, repo):
         """
         Add packages from tests materials to repository and return RPM objects.
         """
-        tests_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
         # Add source and binary packages from tests materials
-        src_rpm = RPM(
-            os.path.join(tests_dir, 'materials', 'pkg-1.0-1.src.rpm')
-        )
-        bin_rpm = RPM(
-            os.path.join(tests_dir, 'materials', 'pkg-1.0-1.noarch.rpm')
-        )
-        repo.add(bin_rpm)
-        repo.add(src_rpm)
+        repo.add(cls.bin_rpm)
+        repo.add(cls.src_rpm)
 
         # Update repository
         repo.update()
 
-        return src_rpm, bin_rpm
+        return cls.src_rpm, cls.bin_rpm
 
     def test_add(self):
         """ Test LocalRepository add """
         archs = ['x86_64', 'aarch64']
-        self.config.update({ 'arch': archs })
-        local_repo_path = make_temp_dir()
-        repo = LocalRepository(local_repo_path, self.config)
+        repo = self._make_repo(archs)
+        local_repo_path = repo.path
 
         # Create repository and add packages
         repo.create()
@@ -189,36 +227,19 @@ class LocalRepositoryTest(RiftTestCase):
 
         # Verify packages are present
         for arch in archs:
-            self.assertTrue(
-                os.path.exists(
-                    os.path.join(
-                        local_repo_path,
-                        arch,
-                        os.path.basename(bin_rpm.filepath)
-                    )
-                )
-            )
-        self.assertTrue(
-            os.path.exists(
-                os.path.join(
-                    local_repo_path, 'SRPMS', os.path.basename(src_rpm.filepath)
-                )
+            self.assertIn(
+                os.path.basename(bin_rpm.filepath),
+                os.listdir(os.path.join(local_repo_path, arch))
             )
+        self.assertIn(
+            os.path.basename(src_rpm.filepath),
+            os.listdir(os.path.join(local_repo_path, 'SRPMS'))
         )
 
-        shutil.rmtree(local_repo_path)
-
     @patch('rift.repository.rpm.Mock')
     def test_search(self, mock_mock):
         """Test search packages on a repository"""
-        archs = ['x86_64', 'aarch64']
-        self.config.update({ 'arch': archs })
-        local_repo_path = make_temp_dir()
-        repo = LocalRepository(local_repo_path, self.config)
-
-        # Create repository and add packages
-        repo.create()
-        (src_rpm, bin_rpm) = self._add_packages(repo)
+        repo = self.shared_repo
 
         # mock Mock.read_spec() to read spec file on host directly
         mock_mock.return_value.read_spec = read_file
@@ -242,24 +263,20 @@ class LocalRepositoryTest(RiftTestCase):
             if pkg.is_source:
                 self.assertEqual(
                     os.path.basename(pkg.filepath),
-                    os.path.basename(src_rpm.filepath)
+                    os.path.basename(self.src_rpm.filepath)
                 )
             else:
                 self.assertEqual(
                     os.path.basename(pkg.filepath),
-                    os.path.basename(bin_rpm.filepath)
+                    os.path.basename(self.bin_rpm.filepath)
                 )
 
-        # Cleanup temporary repository
-        shutil.rmtree(local_repo_path)
-
     @patch('rift.repository.rpm.Mock')
     def test_delete(self, mock_mock):
         """Test delete packages on a repository"""
         archs = ['x86_64', 'aarch64']
-        self.config.update({ 'arch': archs })
-        local_repo_path = make_temp_dir()
-        repo = LocalRepository(local_repo_path, self.config)
+        repo = self._make_repo(archs)
+        local_repo_path = repo.path
 
         # Create repository and add packages
         repo.create()
@@ -274,7 +291,7 @@ class LocalRepositoryTest(RiftTestCase):
         # Search must return 3 results: the source package, the binary package
         # in x86_64 architecture and the same binary package in aarch64
         # architecture.
-        self.assertEqual(len(repo.search('pkg')), 3)
+        self.assertEqual(len(pkgs), 3)
 
         # Delete packages from repository
         for pkg in pkgs:
@@ -283,28 +300,18 @@ class LocalRepositoryTest(RiftTestCase):
 
         # Verify packages are absent
         for arch in archs:
-            self.assertFalse(
-                os.path.exists(
-                    os.path.join(
-                        local_repo_path,
-                        arch,
-                        os.path.basename(bin_rpm.filepath)
-                    )
-                )
-            )
-        self.assertFalse(
-            os.path.exists(
-                os.path.join(
-                    local_repo_path, 'SRPMS', os.path.basename(src_rpm.filepath)
-                )
+            self.assertNotIn(
+                os.path.basename(bin_rpm.filepath),
+                os.listdir(os.path.join(local_repo_path, arch))
             )
+        self.assertNotIn(
+            os.path.basename(src_rpm.filepath),
+            os.listdir(os.path.join(local_repo_path, 'SRPMS'))
         )
 
         # Verify search does not return any result
         self.assertEqual(len(repo.search('pkg')), 0)
 
-        # Cleanup temporary repository
-        shutil.rmtree(local_repo_path)
 
 class ConsumableRepositoryTest(RiftTestCase):
     """
@@ -399,6 +406,16 @@ class ArchRepositoriesRPMTest(RiftTestCase):
     """
     Tests class for ArchRepositoriesRPM
     """
+    @classmethod
+    def setUpClass(cls):
+        # Parent of temporary directories created by tests, removed with all
+        # its content when all tests of the class are done.
+        cls.tmp_dir = make_temp_dir()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_dir)
+
     def setUp(self):
         self.config = Config()
 
@@ -419,7 +436,7 @@ class ArchRepositoriesRPMTest(RiftTestCase):
 
     def test_working(self):
         """Test working repository without supplementary repository"""
-        working_repo_path = make_temp_dir()
+        working_repo_path = make_temp_dir(self.tmp_dir)
         self.config.options['repos'] = {}
         repos = ArchRepositoriesRPM(self.config, working_repo_path, 'x86_64')
         self.assertIsInstance(repos.working, LocalRepository)
@@ -428,11 +445,10 @@ class ArchRepositoriesRPMTest(RiftTestCase):
         self.assertEqual(repos.working.consumables['x86_64'].name, 'working')
         self.assertEqual(repos.working.path, working_repo_path)
         self.assertEqual(repos.all[0], repos.working.consumables['x86_64'])
-        shutil.rmtree(working_repo_path)
 
     def test_working_and_supplementaries(self):
         """Test working repository and two supplementary repositories"""
-        working_repo_path = make_temp_dir()
+        working_repo_path = make_temp_dir(self.tmp_dir)
         self.config.options['repos'] = {
             'os': {
                 'url': 'file:///rift/packages/x86_64/os',
@@ -451,7 +467,6 @@ class ArchRepositoriesRPMTest(RiftTestCase):
         self.assertEqual(repos.supplementaries[0].name, 'os')
         self.assertEqual(repos.all[0], repos.working.consumables['x86_64'])
         self.assertEqual(repos.all[1], repos.supplementaries[0])
-        shutil.rmtree(working_repo_path)
 
     def test_supplementaries_with_arch(self):
         """Test supplementary with $arch placeholder and arch specific value"""
@@ -519,7 +534,7 @@ class ArchRepositoriesRPMTest(RiftTestCase):
 
     def test_delete_matching(self):
         """Test delete_matching() call expected method on working repo"""
-        working_repo_path = make_temp_dir()
+        working_repo_path = make_temp_dir(self.tmp_dir)
         repos = ArchRepositoriesRPM(self.config, working_repo_path, 'x86_64')
         repos.working = Mock(spec=LocalRepository)
         repos.working.search.return_value = []
@@ -527,11 +542,10 @@ class ArchRepositoriesRPMTest(RiftTestCase):
         repos.working.search.assert_called_once_with('pkg')
         repos.working.delete.assert_not_called()
         repos.working.update.assert_called_once()
-        shutil.rmtree(working_repo_path)
 
     def test_delete_matching_not_found(self):
         """Test delete_matching() call expected method on working repo when package not found"""
-        working_repo_path = make_temp_dir()
+        working_repo_path = make_temp_dir(self.tmp_dir)
         repos = ArchRepositoriesRPM(self.config, working_repo_path, 'x86_64')
         repos.working = Mock(spec=LocalRepository)
         repos.working.search.return_value = ['/path/to/pkg.rpm', '/path/to/pkg.src.rpm']
@@ -539,7 +553,6 @@ class ArchRepositoriesRPMTest(RiftTestCase):
         repos.working.search.assert_called_once_with('pkg')
         repos.working.delete.assert_has_calls([call('/path/to/pkg.rpm'), call('/path/to/pkg.src.rpm')])
         repos.working.update.assert_called_once()
-        shutil.rmtree(working_repo_path)
 
     def test_for_variant(self):
         self.config.options['repos'] = {
@@ -580,7 +593,7 @@ class StagingRepositoryRPMTest(RiftTestCase):
 
     def test_init(self):
         tmp_dir = make_temp_dir()
+        self.addCleanup(shutil.rmtree, tmp_dir)
         staging = StagingRepositoryRPM(self.config, tmp_dir)
         self.assertTrue(os.path.exists(os.path.join(tmp_dir, "rpm")))
         self.assertIsInstance(staging.repo, LocalRepository)
-        shutil.rmtree(tmp_dir)
@@ -20,6 +20,10 @@ from rift.sync import (
 )
 from rift import RiftError
 
+MATERIALS_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'materials'
+)
+
 class RepoSyncFactoryTest(RiftTestCase):
     """
     Tests class for RepoSyncFactory
@@ -412,14 +416,9 @@ class RepoSyncDnfTest(RiftTestCase):
         # Create repository
         repo = LocalRepository(self.fake_dnf_repo, self.config)
         repo.create()
-        tests_dir = os.path.dirname(os.path.abspath(__file__))
         # Add source and binary packages from tests materials
-        self.src_rpm = RPM(
-            os.path.join(tests_dir, 'materials', 'pkg-1.0-1.src.rpm')
-        )
-        self.bin_rpm = RPM(
-            os.path.join(tests_dir, 'materials', 'pkg-1.0-1.noarch.rpm')
-        )
+        self.src_rpm = RPM(os.path.join(MATERIALS_DIR, 'pkg-1.0-1.src.rpm'))
+        self.bin_rpm = RPM(os.path.join(MATERIALS_DIR, 'pkg-1.0-1.noarch.rpm'))
         repo.add(self.bin_rpm)
         repo.add(self.src_rpm)
         # Update repository